@@ -0,0 +1,67 @@
+"""
+Outbound bundling benchmark.
+
+Simulates text sources updating ten OSC addresses at 1 kHz for one second and
+counts the UDP datagrams that reach a local receiver with bundling off, with
+16 ms bundles, and with 16 ms bundles plus latest-value coalescing.
+
+Run from the repository root::
+
+    python benchmarks/bench_batching.py
+"""
+
+import os
+import socket
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from osc_io_senders import OutboundBatcher, SenderPool
+
+UPDATES = 1000  # one simulated second at 1 kHz
+ADDRESSES = 10
+WINDOW_MS = 16
+
+
+def count_datagrams(sink):
+    count = 0
+    sink.setblocking(False)
+    while True:
+        try:
+            sink.recv(65536)
+        except BlockingIOError:
+            return count
+        count += 1
+
+
+def run(mode, sink):
+    ip, port = sink.getsockname()
+    pool = SenderPool()
+    batcher = OutboundBatcher(pool, coalesce=mode == "coalesce")
+    received = 0
+    for tick in range(UPDATES):
+        for n in range(ADDRESSES):
+            if mode == "unbatched":
+                pool.send_message(ip, port, f"/desk/fader/{n}", [tick / UPDATES])
+            else:
+                batcher.add(ip, port, f"/desk/fader/{n}", [tick / UPDATES])
+        if mode != "unbatched" and tick % WINDOW_MS == WINDOW_MS - 1:
+            batcher.flush()
+            received += count_datagrams(sink)
+    batcher.flush()
+    pool.close()
+    return received + count_datagrams(sink)
+
+
+def main():
+    for mode in ("unbatched", "bundled", "coalesce"):
+        sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 8 * 1024 * 1024)
+        sink.bind(("127.0.0.1", 0))
+        total = run(mode, sink)
+        sink.close()
+        print(f"{mode:>10}: {total:>6} datagrams for {UPDATES * ADDRESSES} messages")
+
+
+if __name__ == "__main__":
+    main()
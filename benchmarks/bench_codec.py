@@ -0,0 +1,64 @@
+"""
+Payload codec benchmark.
+
+Measures the encode cost per received message (``json.dumps`` of the payload
+dictionary, as ``update_text`` / ``update_browser`` used to do, against
+``PayloadCodec`` in both formats) and the decode cost per send source update
+(``json.loads`` every time against ``PayloadCodec.decode`` with unchanged text).
+
+Run from the repository root::
+
+    python benchmarks/bench_codec.py
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from osc_io_codec import PayloadCodec
+
+MESSAGES = 100000
+SENDER = ("127.0.0.1", 57120)
+SHAPES = {
+    "one float": ("/fader/1", 0.75),
+    "int, float, string": ("/track/3/meter", 3, -12.5, "peak"),
+    "eight floats": ("/tracker/pose", 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8),
+}
+
+
+def per_message_ns(func, *args):
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        func(*args)
+    return (time.perf_counter() - start) / MESSAGES * 1e9
+
+
+def main():
+    json_codec = PayloadCodec("json")
+    compact_codec = PayloadCodec("compact")
+
+    print(f"encode, ns/message ({MESSAGES:,} messages)")
+    print(f"{'arguments':<20} {'json.dumps':>12} {'codec json':>12} {'compact':>12}")
+    for name, args in SHAPES.items():
+        assert json_codec.encode(SENDER, args) == json.dumps({"address": SENDER, "arguments": args})
+        baseline = per_message_ns(lambda: json.dumps({"address": SENDER, "arguments": args}))
+        encoded = per_message_ns(json_codec.encode, SENDER, args)
+        compact = per_message_ns(compact_codec.encode, SENDER, args)
+        print(f"{name:<20} {baseline:>12.0f} {encoded:>12.0f} {compact:>12.0f}")
+
+    print(f"\ndecode, ns/update ({MESSAGES:,} updates)")
+    print(f"{'payload':<20} {'json.loads':>12} {'same text':>12} {'new text':>12}")
+    for name, args in SHAPES.items():
+        text = json.dumps({"address": args[0], "arguments": list(args[1:])})
+        baseline = per_message_ns(json.loads, text)
+        unchanged = per_message_ns(json_codec.decode, text, "Send 1")
+        texts = [text, text + " "]  # alternating text defeats the cache
+        changed = per_message_ns(lambda: json_codec.decode(texts[time.perf_counter_ns() & 1], "Send 2"))
+        print(f"{name:<20} {baseline:>12.0f} {unchanged:>12.0f} {changed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
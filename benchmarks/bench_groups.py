@@ -0,0 +1,121 @@
+"""
+Destination group benchmark.
+
+Loads ``osc_io_textSource`` against the fake ``obspython`` module and sends
+``--updates`` updates of one text source to ``--destinations`` local UDP
+sockets, first as that many unicast clients (one per socket, each encoding and
+sending its own copy), then as one client of a destination group listing the
+same sockets, which encodes each message once and sends the same datagram to
+every address.
+
+Reports the messages encoded, the CPU time per update (including the send
+worker thread) and the datagrams that arrived at the sockets.
+
+Run from the repository root::
+
+    python benchmarks/bench_groups.py [--destinations 20] [--updates 2000]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pythonosc import osc_message_builder
+
+import obspython as obs
+import osc_io_core as core
+
+
+def load(script, args, ports, mode):
+    obs.reset()
+    obs.create_source("Send")
+    settings = obs.obs_data_create()
+    script.script_defaults(settings)
+    obs.obs_data_set_int(settings, "server_port", 0)
+    obs.obs_data_set_bool(settings, "send_skip_unchanged", False)
+    obs.obs_data_set_int(settings, "send_queue_size", args.updates * args.destinations)
+    obs.obs_data_set_int(settings, "send_backlog", args.updates)
+    if mode == "group":
+        settings.values["send_groups"] = ["all 127.0.0.1:" + ",127.0.0.1:".join(str(port) for port in ports)]
+        destinations = [("@all", 1)]
+    else:
+        destinations = [("127.0.0.1", port) for port in ports]
+    obs.obs_data_set_int(settings, "number_of_clients", len(destinations))
+    for i, (client_ip, client_port) in enumerate(destinations):
+        obs.obs_data_set_string(settings, f"client_ip_{i}", client_ip)
+        obs.obs_data_set_int(settings, f"client_port_{i}", client_port)
+        obs.obs_data_set_string(settings, f"text_source_send_{i}", "Send")
+    script.script_load(settings)
+
+
+def run(script, args, sinks, mode):
+    load(script, args, [sink.getsockname()[1] for sink in sinks], mode)
+    update = obs.obs_data_create()
+    source = obs.get_source("Send")
+    encoded = 0
+    build = osc_message_builder.OscMessageBuilder.build
+
+    def counted(self):
+        nonlocal encoded
+        encoded += 1
+        return build(self)
+
+    osc_message_builder.OscMessageBuilder.build = counted
+    start = time.process_time()
+    for i in range(args.updates):
+        obs.obs_data_set_string(update, "text", json.dumps({"address": "/bench/out", "arguments": [i, 0.5, "cue"]}))
+        obs.obs_source_update(source, update)
+    core.send_worker.stop(timeout=60)  # wait for every datagram, however slow
+    cpu = time.process_time() - start
+    osc_message_builder.OscMessageBuilder.build = build
+    script.script_unload()
+
+    received = 0
+    for sink in sinks:
+        try:
+            while True:
+                sink.recv(65536)
+                received += 1
+        except socket.timeout:
+            pass
+    return encoded, cpu / args.updates, received
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--destinations", type=int, default=20)
+    parser.add_argument("--updates", type=int, default=2000)
+    args = parser.parse_args()
+
+    sinks = []
+    for _ in range(args.destinations):
+        sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        sink.bind(("127.0.0.1", 0))
+        sink.settimeout(0.05)
+        sinks.append(sink)
+
+    print(f"{args.updates:,} updates to {args.destinations} destinations, {args.updates * args.destinations:,} datagrams expected")
+    print(f"{'mode':<8} {'encoded':>8} {'cpu us/update':>14} {'received':>9}")
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        import osc_io_textSource as script
+    failed = False
+    for mode in ("unicast", "group"):
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            encoded, cpu, received = run(script, args, sinks, mode)
+        print(f"{mode:<8} {encoded:>8,} {cpu * 1e6:>14.1f} {received:>9,}")
+        failed = failed or received != args.updates * args.destinations
+    for sink in sinks:
+        sink.close()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Ingest micro-benchmark.
+
+Compares the CPU time per received packet of python-osc's dispatcher, which
+decodes every message before the default handler routes it, with
+``OscIngest``, which reads the address, routes it and decodes the arguments
+only of messages that match a client. The traffic is a mix of single messages
+and bundles in which only ``--routed`` of the messages match one of 50 client
+addresses; the rest are for other devices on the network and carry more
+arguments, as lighting and mixer traffic does.
+
+Run from the repository root::
+
+    python benchmarks/bench_ingest.py [--packets 20000] [--routed 0.1]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pythonosc import dispatcher, osc_bundle_builder, osc_message_builder
+
+from osc_io_ingest import OscIngest
+from osc_io_routing import RoutingTable
+
+CLIENTS = 50
+CLIENT_ADDRESS = ("192.168.1.50", 57120)
+
+
+def build_message(address, arguments):
+    builder = osc_message_builder.OscMessageBuilder(address=address)
+    for argument in arguments:
+        builder.add_arg(argument)
+    return builder.build()
+
+
+def make_message(routed):
+    if routed:
+        return build_message(f"/show/fader/{random.randrange(CLIENTS) + 1}", [random.random()])
+    # other devices: a fixture update with several values, a name and a blob
+    return build_message(f"/lights/fixture/{random.randrange(500)}/state", [random.random() for _ in range(8)] + ["wash", bytes(32)])
+
+
+def make_traffic(packets, routed, bundle_share=0.25):
+    traffic = []
+    for _ in range(packets):
+        if random.random() < bundle_share:
+            bundle = osc_bundle_builder.OscBundleBuilder(osc_bundle_builder.IMMEDIATELY)
+            for _ in range(4):
+                bundle.add_content(make_message(random.random() < routed))
+            traffic.append(bundle.build().dgram)
+        else:
+            traffic.append(make_message(random.random() < routed).dgram)
+    return traffic
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--packets", type=int, default=20000)
+    parser.add_argument("--routed", type=float, default=0.1, help="share of messages that match a client")
+    args = parser.parse_args()
+
+    random.seed(1)
+    router = RoutingTable([{"osc_address": f"/show/fader/{i + 1}"} for i in range(CLIENTS)])
+    traffic = make_traffic(args.packets, args.routed)
+    delivered = []
+
+    def route_message(client_address, address, *arguments):
+        matched = router.match(address)
+        if matched:
+            delivered.append(arguments)
+
+    disp = dispatcher.Dispatcher()
+    disp.set_default_handler(route_message, True)
+
+    def select(address):
+        return router.match(address) or None
+
+    ingest = OscIngest(select, lambda client_address, arguments, matched: delivered.append(arguments))
+
+    results = {}
+    for name, target in (("python-osc", disp), ("ingest", ingest)):
+        delivered.clear()
+        elapsed = min(timeit.repeat(lambda: [target.call_handlers_for_packet(data, CLIENT_ADDRESS) for data in traffic], number=1, repeat=3))
+        results[name] = (elapsed / args.packets * 1e6, len(delivered) // 3)
+
+    print(f"{args.packets:,} packets, {args.routed:.0%} of messages routed, 25% of packets are 4-message bundles")
+    print(f"{'dispatcher':<12} {'us/packet':>10} {'delivered':>10}")
+    for name, (us, count) in results.items():
+        print(f"{name:<12} {us:>10.2f} {count:>10,}")
+    print(f"speedup: {results['python-osc'][0] / results['ingest'][0]:.1f}x")
+    print(f"ingest counters: {ingest.counters}")
+
+
+if __name__ == "__main__":
+    main()
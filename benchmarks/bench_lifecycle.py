@@ -0,0 +1,134 @@
+"""
+Server lifecycle harness.
+
+Loads and unloads ``osc_io_textSource`` against the fake ``obspython`` module
+``--cycles`` times per server engine, always on the same port, as when OBS
+reloads the script. Every ``--check-every`` cycles a datagram is sent to the
+port and must arrive. Reports how long ``script_unload`` takes and fails if a
+load does not get the port back, a datagram is lost, or threads or file
+descriptors are left behind after the last unload.
+
+Then it holds the port with another socket and checks that a start which
+cannot bind leaves the server stopped, with the error in the status text.
+
+Run from the repository root::
+
+    python benchmarks/bench_lifecycle.py [--cycles 1000] [--check-every 100]
+"""
+
+import argparse
+import contextlib
+import os
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import obspython as obs
+import osc_io_core as core
+
+
+def open_fds():
+    """Open file descriptors of this process, where the platform lists them."""
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def make_settings(script, engine, port):
+    settings = obs.obs_data_create()
+    script.script_defaults(settings)
+    obs.obs_data_set_string(settings, "server_ip", "127.0.0.1")
+    obs.obs_data_set_int(settings, "server_port", port)
+    obs.obs_data_set_string(settings, "server_engine", engine)
+    return settings
+
+
+def delivered(sender, port):
+    """Sends one datagram to the server and waits for its listener to count it."""
+    sender.sendto(b"/lifecycle\x00\x00,\x00\x00\x00", ("127.0.0.1", port))
+    deadline = time.perf_counter() + 1.0
+    while time.perf_counter() < deadline:
+        if any(counters["packets"] for counters in core.listeners.stats().values()):
+            return True
+        time.sleep(0.0005)
+    return False
+
+
+def run(script, engine, port, args, sender):
+    settings = make_settings(script, engine, port)
+    unload_times = []
+    failures = []
+    for cycle in range(args.cycles):
+        script.script_load(settings)
+        if not core.server_running:
+            failures.append(f"cycle {cycle}: {core.server_status()}")
+            script.script_unload()
+            continue
+        if cycle % args.check_every == 0 and not delivered(sender, port):
+            failures.append(f"cycle {cycle}: datagram not received")
+        start = time.perf_counter()
+        script.script_unload()
+        unload_times.append(time.perf_counter() - start)
+    return unload_times, failures
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--cycles", type=int, default=1000)
+    parser.add_argument("--check-every", type=int, default=100, help="send a datagram every N cycles")
+    args = parser.parse_args()
+
+    obs.reset()
+    port = free_port()
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        import osc_io_textSource as script
+
+    print(f"{args.cycles:,} load/unload cycles per engine on port {port}")
+    print(f"{'engine':<10} {'unload p50 ms':>14} {'p99 ms':>8} {'max ms':>8} {'failures':>9} {'threads':>8} {'fds':>6}")
+    failed = False
+    for _, engine in core.SERVER_ENGINES:
+        threads, fds = threading.active_count(), open_fds()
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            unload_times, failures = run(script, engine, port, args, sender)
+        unload_times.sort()
+        leaked_threads = threading.active_count() - threads
+        leaked_fds = open_fds() - fds if fds is not None else 0
+        p50 = unload_times[len(unload_times) // 2] * 1000 if unload_times else 0
+        p99 = unload_times[int(len(unload_times) * 0.99)] * 1000 if unload_times else 0
+        print(f"{engine:<10} {p50:>14.2f} {p99:>8.2f} {max(unload_times, default=0) * 1000:>8.2f} {len(failures):>9} "
+              f"{leaked_threads:>+8} {leaked_fds:>+6}")
+        for failure in failures[:5]:
+            print(f"  {failure}")
+        failed = failed or bool(failures) or leaked_threads > 0 or leaked_fds > 0
+
+    # a port held by a socket without SO_REUSEADDR cannot be bound again
+    blocker = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    blocker.bind(("127.0.0.1", port))
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        script.script_load(make_settings(script, core.DEFAULT_SERVER_ENGINE, port))
+        running, status = core.server_running, core.server_status()
+        script.script_unload()
+    blocker.close()
+    print(f"port taken: running={running}, status: {status}")
+    failed = failed or running or "could not listen" not in status
+
+    sender.close()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
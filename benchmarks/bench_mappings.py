@@ -0,0 +1,64 @@
+"""
+Bulk mapping load benchmark.
+
+Times parsing and validating a 5,000 row routing table in both supported
+formats. The target is well under 50 ms per load.
+
+Run from the repository root::
+
+    python benchmarks/bench_mappings.py
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from osc_io_mappings import parse_mappings
+
+ROWS = 5000
+FIELDS = {"text_source_receive_name": "", "text_source_send_name": ""}
+
+
+def make_rows(count):
+    return [{
+        "client_ip": f"10.0.{i // 250}.{i % 250 + 1}",
+        "client_port": 9000 + (i % 100),
+        "osc_address": f"/show/group{i // 100}/fader{i}",
+        "text_source_receive_name": f"Receive {i % 50}",
+        "text_source_send_name": "",
+    } for i in range(count)]
+
+
+def best_of(runs, func):
+    best = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    rows = make_rows(ROWS)
+    json_text = json.dumps(rows)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(rows[0]))
+    writer.writeheader()
+    writer.writerows(rows)
+    csv_text = buffer.getvalue()
+
+    for name, text in (("json", json_text), ("csv", csv_text)):
+        clients, errors = parse_mappings(text, FIELDS)
+        assert len(clients) == ROWS and not errors, errors[:5]
+        elapsed = best_of(5, lambda: parse_mappings(text, FIELDS))
+        print(f"{name}: {ROWS} rows in {elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
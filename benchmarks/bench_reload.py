@@ -0,0 +1,139 @@
+"""
+Hot reload harness.
+
+Loads ``osc_io_textSource`` against the fake ``obspython`` module and floods
+it with OSC from a separate process while the client mappings change every
+``--interval`` seconds through ``script_update``, as when they are edited in
+the script properties. Each change removes or restores half of the clients and
+moves the first client to another OSC address.
+
+Every flooded message is routed to exactly one text source (a client's, or
+"OSC Message" when no client matches), so the messages that reached the
+receive queue are counted exactly. The run fails if any message was lost or
+dropped. ``--restart`` stops and starts the server on every change instead, as
+applying a mapping change used to require, for comparison.
+
+Run from the repository root::
+
+    python benchmarks/bench_reload.py [--count 20000] [--rate 5000] [--interval 0.1] [--restart]
+"""
+
+import argparse
+import contextlib
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import obspython as obs
+import osc_io_core as core
+from osc_flood import flood
+
+TICK = 1 / 60
+CLIENTS = 50
+
+
+def free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def set_mappings(settings, generation):
+    """Even generations map every client, odd ones half of them with client 1 moved."""
+    obs.obs_data_set_int(settings, "number_of_clients", CLIENTS if generation % 2 == 0 else CLIENTS // 2)
+    obs.obs_data_set_string(settings, "osc_address_0", "/bench/fader/1" if generation % 2 == 0 else "/bench/moved")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--rate", type=int, default=5000, help="messages per second, 0 = unlimited")
+    parser.add_argument("--interval", type=float, default=0.1, help="seconds between mapping changes")
+    parser.add_argument("--restart", action="store_true", help="restart the server on every change")
+    args = parser.parse_args()
+
+    obs.reset()
+    obs.create_source("OSC Message")
+    for i in range(CLIENTS):
+        obs.create_source(f"Receive {i}")
+        obs.create_source(f"Send {i}")
+    port = free_port()
+
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        import osc_io_textSource as script
+
+        settings = obs.obs_data_create()
+        script.script_defaults(settings)
+        obs.obs_data_set_int(settings, "server_port", port)
+        obs.obs_data_set_int(settings, "receive_buffer_kb", 4096)
+        obs.obs_data_set_int(settings, "receive_queue_size", 65536)
+        obs.obs_data_set_int(settings, "receive_batch_size", 0)
+        for i in range(CLIENTS):
+            obs.obs_data_set_string(settings, f"client_ip_{i}", "127.0.0.1")
+            obs.obs_data_set_int(settings, f"client_port_{i}", 9)
+            obs.obs_data_set_string(settings, f"text_source_receive_{i}", f"Receive {i}")
+            obs.obs_data_set_string(settings, f"text_source_send_{i}", f"Send {i}")
+            obs.obs_data_set_string(settings, f"osc_address_{i}", f"/bench/fader/{i + 1}")
+        set_mappings(settings, 0)
+        script.script_load(settings)
+
+        addresses = [f"/bench/fader/{n}" for n in range(1, CLIENTS + 1)]
+        # spawned, not forked, so the sender does not inherit (and hold open) the server socket
+        sender = multiprocessing.get_context("spawn").Process(target=flood, args=("127.0.0.1", port, args.count, args.rate, addresses, "sequential"))
+        sender.start()
+
+        reload_times = []
+        generation = 0
+        next_change = time.perf_counter() + args.interval
+        next_tick = time.perf_counter()
+        idle_since = None
+        while True:
+            script.script_tick(TICK)
+            now = time.perf_counter()
+            if sender.is_alive() and now >= next_change:
+                generation += 1
+                set_mappings(settings, generation)
+                start = time.perf_counter()
+                if args.restart:
+                    core.stop_osc_server()
+                    core.start_osc_server(script.sink)
+                script.script_update(settings)
+                reload_times.append(time.perf_counter() - start)
+                next_change = now + args.interval
+
+            # stop once the sender is done and nothing arrived for a while
+            if sender.is_alive() or len(core.receive_queue):
+                idle_since = None
+            elif idle_since is None:
+                idle_since = now
+                seen = core.receive_queue.counters["enqueued"]
+            elif now - idle_since > 0.25:
+                if core.receive_queue.counters["enqueued"] == seen:
+                    break
+                idle_since = None
+            next_tick += TICK
+            time.sleep(max(0.0, next_tick - time.perf_counter()))
+        sender.join()
+
+        counters = dict(core.receive_queue.counters)
+        routed = len(core.router)
+        script.script_unload()
+
+    lost = args.count - counters["enqueued"]
+    mode = "restart" if args.restart else "hot reload"
+    print(f"{args.count:,} messages at {args.rate or 'max'} msgs/s, mappings changed every {args.interval:g} s ({mode})")
+    print(f"changes: {len(reload_times)}, mean {sum(reload_times) / max(1, len(reload_times)) * 1000:.2f} ms, "
+          f"max {max(reload_times, default=0) * 1000:.2f} ms; {routed} clients at the end")
+    print(f"received: {counters['enqueued']:,}, lost: {lost:,}, queue drops: {counters['dropped']}")
+    if lost or counters["dropped"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
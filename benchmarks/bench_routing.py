@@ -0,0 +1,58 @@
+"""
+Routing micro-benchmark.
+
+Compares the per-packet linear ``startswith`` scan the scripts used to do with
+the segment trie in ``osc_io_routing``, for 10 up to 10,000 client mappings.
+
+Run from the repository root::
+
+    python benchmarks/bench_routing.py
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from osc_io_routing import RoutingTable
+
+SIZES = [10, 100, 1000, 10000]
+LOOKUPS = 20000
+
+
+def make_clients(count):
+    clients = []
+    for i in range(count):
+        clients.append({
+            "client_ip": "127.0.0.1",
+            "client_port": 9000 + (i % 100),
+            "text_source_receive_name": f"Receive {i}",
+            "osc_address": f"/show/group{i // 100}/fader{i}",
+        })
+    # a few wildcard routes, as a lighting desk configuration would have
+    clients.append({"client_ip": "127.0.0.1", "client_port": 9000, "osc_address": "/show/*/mute"})
+    clients.append({"client_ip": "127.0.0.1", "client_port": 9000, "osc_address": "/show/group[0-9]/{go,stop}"})
+    return clients
+
+
+def linear_match(clients, address):
+    return next((client for client in clients if address.startswith(client["osc_address"])), None)
+
+
+def main():
+    random.seed(1)
+    print(f"{'mappings':>10} {'linear us/op':>14} {'trie us/op':>12}")
+    for size in SIZES:
+        clients = make_clients(size)
+        table = RoutingTable(clients)
+        addresses = [f"/show/group{i // 100}/fader{i}/value" for i in random.choices(range(size), k=LOOKUPS)]
+
+        linear = timeit.timeit(lambda: [linear_match(clients, a) for a in addresses], number=1)
+        trie = timeit.timeit(lambda: [table.match(a) for a in addresses], number=1)
+        print(f"{size:>10} {linear / LOOKUPS * 1e6:>14.2f} {trie / LOOKUPS * 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
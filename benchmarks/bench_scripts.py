@@ -0,0 +1,179 @@
+"""
+End-to-end load test of the OBS scripts.
+
+Loads ``osc_io_textSource`` and ``osc_io_browserSource`` against the fake
+``obspython`` module, one after the other, and for each:
+
+* receive: floods the script's OSC server from a separate process while the
+  main thread calls ``script_tick`` at 60 fps like OBS does. Every text source
+  update and ``javascript_event`` call is recorded with its time, and the send
+  time carried in the last OSC argument gives the end-to-end latency;
+* send: updates a send text source with new text repeatedly and counts the
+  datagrams that arrive at the client.
+
+Reports throughput, p50/p99 latency and packet loss (messages that never
+reached the script, plus messages the receive queue dropped).
+
+Run from the repository root::
+
+    python benchmarks/bench_scripts.py [--count 20000] [--rate 5000] [--clients 50] [--distribution zipf]
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import obspython as obs
+import osc_io_core as core
+from osc_flood import DISTRIBUTIONS, flood
+
+MODULES = {
+    "osc_io_textSource": "text_source_receive",
+    "osc_io_browserSource": "browser_source_name",
+}
+TICK = 1 / 60
+SEND_UPDATES = 5000
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def load_script(module_name, receive_field, clients, sink_port, engine):
+    obs.reset()
+    for i in range(clients):
+        obs.create_source(f"Receive {i}")
+        obs.create_source(f"Send {i}")
+    script = importlib.import_module(module_name)
+
+    settings = obs.obs_data_create()
+    script.script_defaults(settings)
+    obs.obs_data_set_int(settings, "server_port", 0)
+    obs.obs_data_set_string(settings, "server_engine", engine)
+    obs.obs_data_set_int(settings, "receive_batch_size", 0)
+    # the send test updates in one burst, faster than the send worker drains
+    obs.obs_data_set_int(settings, "send_queue_size", SEND_UPDATES)
+    obs.obs_data_set_int(settings, "send_backlog", SEND_UPDATES)
+    obs.obs_data_set_int(settings, "number_of_clients", clients)
+    for i in range(clients):
+        obs.obs_data_set_string(settings, f"client_ip_{i}", "127.0.0.1")
+        obs.obs_data_set_int(settings, f"client_port_{i}", sink_port)
+        obs.obs_data_set_string(settings, f"{receive_field}_{i}", f"Receive {i}")
+        obs.obs_data_set_string(settings, f"text_source_send_{i}", f"Send {i}")
+        obs.obs_data_set_string(settings, f"osc_address_{i}", f"/bench/fader/{i + 1}")
+    script.script_load(settings)
+    return script
+
+
+def payload_sent_at(kind, data):
+    """Returns the send time carried by a recorded update or javascript_event."""
+    text = data["text"] if kind == "update" else data[1]["jsonString"]
+    decoded = json.loads(text)
+    arguments = decoded["arguments"] if isinstance(decoded, dict) else decoded
+    return arguments[-1]
+
+
+def run_receive(script, args):
+    recorded = []
+    obs.set_recorder(lambda kind, source, data: kind in ("update", "proc") and recorded.append((time.time(), kind, data)))
+
+    host, port = core.listeners.server_addresses[0][:2]
+    addresses = [f"/bench/fader/{n}" for n in range(1, args.clients + 1)]
+    sender = multiprocessing.Process(target=flood, args=(host, port, args.count, args.rate, addresses, args.distribution))
+    enqueued_before = core.receive_queue.counters["enqueued"]
+    dropped_before = core.receive_queue.counters["dropped"]
+    start = time.perf_counter()
+    sender.start()
+
+    # tick like OBS until the sender is done and nothing arrived for a while
+    next_tick = time.perf_counter()
+    idle_since = None
+    while True:
+        script.script_tick(TICK)
+        if sender.is_alive() or len(core.receive_queue):
+            idle_since = None
+        elif idle_since is None:
+            idle_since = time.perf_counter()
+            seen = core.receive_queue.counters["enqueued"]
+        elif time.perf_counter() - idle_since > 0.25:
+            if core.receive_queue.counters["enqueued"] == seen:
+                break
+            idle_since = None
+        next_tick += TICK
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+    elapsed = time.perf_counter() - start - 0.25
+    sender.join()
+    obs.set_recorder(None)
+
+    latencies = [applied_at - payload_sent_at(kind, data) for applied_at, kind, data in recorded]
+    counters = core.receive_queue.counters
+    lost = args.count - (counters["enqueued"] - enqueued_before)
+    return {
+        "applied/s": len(recorded) / elapsed,
+        "p50 ms": percentile(latencies, 0.5) * 1000,
+        "p99 ms": percentile(latencies, 0.99) * 1000,
+        "udp loss": 100 * lost / args.count,
+        "queue drops": counters["dropped"] - dropped_before,
+    }
+
+
+def run_send(script, sink):
+    sink.settimeout(0.2)
+    source = obs.get_source("Send 0")
+    update = obs.obs_data_create()
+    start = time.perf_counter()
+    for i in range(SEND_UPDATES):
+        obs.obs_data_set_string(update, "text", json.dumps({"address": "/bench/out", "arguments": [i]}))
+        obs.obs_source_update(source, update)
+    script.script_tick(TICK)  # flushes bundles and held messages if enabled
+    elapsed = time.perf_counter() - start
+
+    received = 0
+    try:
+        while True:
+            sink.recv(65536)
+            received += 1
+    except socket.timeout:
+        pass
+    return {"updates/s": SEND_UPDATES / elapsed, "received": received}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--rate", type=int, default=5000, help="messages per second, 0 = unlimited")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="uniform")
+    parser.add_argument("--engine", default="single")
+    args = parser.parse_args()
+
+    print(f"{args.count:,} messages at {args.rate or 'max'} msgs/s to {args.clients} clients ({args.distribution}, {args.engine} engine)")
+    print(f"{'module':<22} {'applied/s':>10} {'p50 ms':>8} {'p99 ms':>8} {'udp loss':>9} {'q drops':>8} {'sends/s':>10} {'sent':>7}")
+    for module_name, receive_field in MODULES.items():
+        sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+        sink.bind(("127.0.0.1", 0))
+        # the scripts log to stdout; keep the report readable
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            script = load_script(module_name, receive_field, args.clients, sink.getsockname()[1], args.engine)
+            receive = run_receive(script, args)
+            send = run_send(script, sink)
+            script.script_unload()
+        sink.close()
+        print(f"{module_name:<22} {receive['applied/s']:>10,.0f} {receive['p50 ms']:>8.2f} {receive['p99 ms']:>8.2f} "
+              f"{receive['udp loss']:>8.1f}% {receive['queue drops']:>8} {send['updates/s']:>10,.0f} {send['received']:>7}/{SEND_UPDATES}")
+
+
+if __name__ == "__main__":
+    main()
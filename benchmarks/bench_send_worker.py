@@ -0,0 +1,120 @@
+"""
+Send worker benchmark.
+
+Loads ``osc_io_textSource`` against the fake ``obspython`` module with
+``--clients`` clients sending from one text source, updates that source
+``--updates`` times at ``--rate`` updates/second and measures how long each
+update's signal callback holds up the thread that updated the source.
+
+Two destinations are compared: a local socket, and the same socket behind a
+simulated stall of ``--delay-ms`` per datagram (a slow hostname lookup or a
+congested link). ``sync`` sends from the callback, as ``deliver_osc_message``
+used to; ``worker`` hands each message to ``SendWorker``. The last columns
+count the datagrams that arrived and the messages the worker dropped.
+
+Run from the repository root::
+
+    python benchmarks/bench_send_worker.py [--clients 4] [--updates 2000] [--rate 1000] [--delay-ms 5]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import obspython as obs
+import osc_io_core as core
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def load(script, clients, port):
+    settings = obs.obs_data_create()
+    script.script_defaults(settings)
+    obs.obs_data_set_int(settings, "server_port", 0)
+    obs.obs_data_set_int(settings, "number_of_clients", clients)
+    for i in range(clients):
+        obs.obs_data_set_string(settings, f"client_ip_{i}", "127.0.0.1")
+        obs.obs_data_set_int(settings, f"client_port_{i}", port)
+        obs.obs_data_set_string(settings, f"text_source_send_{i}", "Send")
+        obs.obs_data_set_string(settings, f"osc_address_{i}", f"/bench/fader/{i + 1}")
+    script.script_load(settings)
+
+
+def run(script, mode, delay, args, sink):
+    obs.reset()
+    obs.create_source("Send")
+    load(script, args.clients, sink.getsockname()[1])
+
+    send_message = core.senders.send_message
+    if delay:
+        def stalled(*message):
+            time.sleep(delay)
+            send_message(*message)
+        core.senders.send_message = stalled
+    if mode == "sync":
+        core.send_worker.submit = core.senders.send_message
+
+    dropped = core.send_worker.counters["dropped"]
+    source = obs.get_source("Send")
+    update = obs.obs_data_create()
+    durations = []
+    next_update = time.perf_counter()
+    for i in range(args.updates):
+        obs.obs_data_set_string(update, "text", json.dumps({"address": "/bench/out", "arguments": [i]}))
+        start = time.perf_counter()
+        obs.obs_source_update(source, update)
+        durations.append(time.perf_counter() - start)
+        next_update += 1 / args.rate
+        time.sleep(max(0.0, next_update - time.perf_counter()))
+    script.script_unload()
+    dropped = core.send_worker.counters["dropped"] - dropped
+    core.senders.send_message = send_message
+    vars(core.send_worker).pop("submit", None)
+
+    received = 0
+    try:
+        while True:
+            sink.recv(65536)
+            received += 1
+    except socket.timeout:
+        pass
+    return durations, received, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=2000)
+    parser.add_argument("--rate", type=int, default=1000, help="updates per second")
+    parser.add_argument("--delay-ms", type=float, default=5.0, help="simulated stall per datagram to the slow destination")
+    args = parser.parse_args()
+
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
+    sink.bind(("127.0.0.1", 0))
+    sink.settimeout(0.2)
+
+    print(f"{args.updates:,} updates at {args.rate} updates/s to {args.clients} clients")
+    print(f"{'destination':<12} {'mode':<7} {'p50 us':>8} {'p99 us':>9} {'max us':>9} {'received':>9} {'dropped':>8}")
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        import osc_io_textSource as script
+    for label, delay in (("local", 0.0), (f"{args.delay_ms:g} ms stall", args.delay_ms / 1000)):
+        for mode in ("sync", "worker"):
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                durations, received, dropped = run(script, mode, delay, args, sink)
+            print(f"{label:<12} {mode:<7} {percentile(durations, 0.5) * 1e6:>8.1f} {percentile(durations, 0.99) * 1e6:>9.1f} "
+                  f"{max(durations) * 1e6:>9.1f} {received:>9,} {dropped:>8,}")
+    sink.close()
+
+
+if __name__ == "__main__":
+    main()
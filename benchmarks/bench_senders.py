@@ -0,0 +1,59 @@
+"""
+Sender pool benchmark.
+
+Compares messages/second of constructing a new ``SimpleUDPClient`` per message
+(what ``send_osc_message`` used to do) against the persistent ``SenderPool``.
+Messages go to a local UDP socket that is bound but never read.
+
+Run from the repository root::
+
+    python benchmarks/bench_senders.py
+"""
+
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pythonosc import udp_client
+
+from osc_io_senders import SenderPool
+
+MESSAGES = 20000
+
+
+def per_call(ip, port):
+    osc_client = udp_client.SimpleUDPClient(ip, port)
+    osc_client.send_message("/bench/value", [1, 0.5, "text"])
+    # without this the benchmark runs out of file descriptors, as OBS eventually does
+    osc_client._sock.close()
+
+
+def main():
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(("127.0.0.1", 0))
+    ip, port = sink.getsockname()
+
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        per_call(ip, port)
+    per_call_rate = MESSAGES / (time.perf_counter() - start)
+
+    pool = SenderPool()
+    pool.open([{"client_ip": ip, "client_port": port}])
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        pool.send_message(ip, port, "/bench/value", [1, 0.5, "text"])
+    pooled_rate = MESSAGES / (time.perf_counter() - start)
+    print(f"pool counters: {pool.stats()}")
+    pool.close()
+    sink.close()
+
+    print(f"per-call client: {per_call_rate:>10,.0f} msgs/s")
+    print(f"pooled client:   {pooled_rate:>10,.0f} msgs/s ({pooled_rate / per_call_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Server engine benchmark.
+
+Floods each engine from ``osc_io_server`` with OSC messages from a separate
+process and reports throughput, packet loss and p50/p99 receive latency.
+
+Run from the repository root::
+
+    python benchmarks/bench_server.py [--count 20000] [--rate 0]
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from pythonosc import dispatcher
+
+from osc_flood import flood
+from osc_io_server import SERVER_ENGINES, create_server
+
+
+def percentile(values, fraction):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_engine(engine, count, rate):
+    latencies = []
+
+    def handler(client_address, address, *args):
+        latencies.append(time.time() - args[-1])
+
+    disp = dispatcher.Dispatcher()
+    disp.set_default_handler(handler, True)
+    server = create_server(engine, ("127.0.0.1", 0), disp)
+    host, port = server.server_address[:2]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    sender = multiprocessing.Process(target=flood, args=(host, port, count, rate))
+    start = time.perf_counter()
+    sender.start()
+    sender.join()
+    # wait for the receiver to catch up, then stop
+    previous = -1
+    while previous != len(latencies):
+        previous = len(latencies)
+        time.sleep(0.2)
+    elapsed = time.perf_counter() - start - 0.2
+
+    server.shutdown()
+    thread.join()
+    server.server_close()
+
+    received = len(latencies)
+    print(f"{engine:>10} {received / elapsed:>12,.0f} {100 * (count - received) / count:>7.1f}% "
+          f"{percentile(latencies, 0.5) * 1000:>9.2f} {percentile(latencies, 0.99) * 1000:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--rate", type=int, default=0, help="messages per second, 0 = unlimited")
+    args = parser.parse_args()
+
+    print(f"{'engine':>10} {'msgs/s':>12} {'loss':>8} {'p50 ms':>9} {'p99 ms':>9}")
+    for _, engine in SERVER_ENGINES:
+        run_engine(engine, args.count, args.rate)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Source cache harness.
+
+Loads ``osc_io_textSource`` against the fake ``obspython`` module, pushes
+messages through the receive path and the send path, and counts how often the
+script calls ``obs_get_source_by_name``. Also checks that renaming and
+removing a source invalidates the cache.
+
+Run from the repository root::
+
+    python benchmarks/bench_source_cache.py
+"""
+
+import contextlib
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import obspython as obs
+
+CLIENTS = 50
+MESSAGES = 10000
+
+
+def main():
+    results = []
+    # the script prints to the OBS log; keep the benchmark output readable
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        run(results)
+    print("\n".join(results))
+
+
+def run(results):
+    for i in range(CLIENTS):
+        obs.create_source(f"Receive {i}")
+        obs.create_source(f"Send {i}")
+
+    import osc_io_core as core
+    import osc_io_textSource as script
+
+    settings = obs.obs_data_create()
+    script.script_defaults(settings)
+    obs.obs_data_set_int(settings, "server_port", 0)  # any free port
+    obs.obs_data_set_int(settings, "number_of_clients", CLIENTS)
+    for i in range(CLIENTS):
+        obs.obs_data_set_string(settings, f"client_ip_{i}", "127.0.0.1")
+        obs.obs_data_set_int(settings, f"client_port_{i}", 9)
+        obs.obs_data_set_string(settings, f"text_source_receive_{i}", f"Receive {i}")
+        obs.obs_data_set_string(settings, f"text_source_send_{i}", f"Send {i}")
+        obs.obs_data_set_string(settings, f"osc_address_{i}", f"/fader/{i}")
+    obs.obs_data_set_int(settings, "receive_batch_size", 0)
+    script.script_load(settings)
+
+    obs.calls.clear()
+    for n in range(MESSAGES):
+        core.route_message(("127.0.0.1", 9000), f"/fader/{n % CLIENTS}", n)
+        if n % 100 == 99:
+            script.script_tick(1 / 60)
+    script.script_tick(1 / 60)
+    applied = core.receive_queue.counters["applied"]
+    results.append(f"receive: {applied} messages applied, {obs.calls['obs_get_source_by_name']} obs_get_source_by_name calls "
+                   f"(was one per message), cache {core.source_cache.counters}")
+
+    obs.calls.clear()
+    send_source = obs.get_source("Send 0")
+    update = obs.obs_data_create()
+    obs.obs_data_set_string(update, "text", '{"address": "/out", "arguments": [1]}')
+    for _ in range(1000):
+        obs.obs_source_update(send_source, update)
+    core.send_worker.stop()  # sends what is still queued
+    results.append(f"send: 1000 updates, {obs.calls['obs_get_source_by_name']} obs_get_source_by_name calls, "
+                   f"{core.senders.stats()}")
+
+    obs.rename_source("Receive 1", "Receive 1 (old)")
+    assert core.source_cache.get("Receive 1") is None, "renamed source still cached"
+    obs.create_source("Receive 1")
+    assert core.source_cache.get("Receive 1") is obs.get_source("Receive 1"), "created source not picked up"
+    obs.remove_source("Receive 2")
+    assert core.source_cache.get("Receive 2") is None, "removed source still cached"
+    results.append("rename/create/destroy invalidation: ok")
+
+    script.script_unload()
+
+
+if __name__ == "__main__":
+    main()
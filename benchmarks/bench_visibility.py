@@ -0,0 +1,101 @@
+"""
+Visibility harness.
+
+Loads ``osc_io_textSource`` against the fake ``obspython`` module with
+``--clients`` receive text sources, of which only ``--visible`` are showing,
+as in a scene collection where most OSC text sources sit in other scenes. It
+routes ``--frames`` frames of messages (one per client per frame) and ticks
+once per frame, first with Update Receive Sources set to Always, then to Only
+When Showing, and reports the ``obs_source_update`` calls (each one redraws a
+text source in OBS) and the tick time.
+
+Then it shows every hidden source and checks that each one received the last
+value sent to it while it was hidden.
+
+Run from the repository root::
+
+    python benchmarks/bench_visibility.py [--clients 50] [--visible 5] [--frames 600]
+"""
+
+import argparse
+import contextlib
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import obspython as obs
+import osc_io_core as core
+
+TICK = 1 / 60
+
+
+def load(script, args, mode):
+    obs.reset()
+    for i in range(args.clients):
+        obs.create_source(f"Receive {i}")
+        obs.set_source_visibility(f"Receive {i}", i < args.visible)
+
+    settings = obs.obs_data_create()
+    script.script_defaults(settings)
+    obs.obs_data_set_int(settings, "server_port", 0)
+    obs.obs_data_set_int(settings, "receive_batch_size", 0)
+    obs.obs_data_set_string(settings, "receive_visibility", mode)
+    obs.obs_data_set_int(settings, "number_of_clients", args.clients)
+    for i in range(args.clients):
+        obs.obs_data_set_string(settings, f"client_ip_{i}", "127.0.0.1")
+        obs.obs_data_set_int(settings, f"client_port_{i}", 9)
+        obs.obs_data_set_string(settings, f"text_source_receive_{i}", f"Receive {i}")
+        obs.obs_data_set_string(settings, f"osc_address_{i}", f"/fader/{i}")
+    script.script_load(settings)
+
+
+def run(script, args, mode):
+    load(script, args, mode)
+    obs.calls.clear()
+    tick_time = 0.0
+    for frame in range(args.frames):
+        for i in range(args.clients):
+            core.route_message(("127.0.0.1", 9000), f"/fader/{i}", frame)
+        start = time.perf_counter()
+        script.script_tick(TICK)
+        tick_time += time.perf_counter() - start
+    updates = obs.calls["obs_source_update"]
+
+    # everything comes into view: held values must arrive on the next tick
+    for i in range(args.visible, args.clients):
+        obs.set_source_visibility(f"Receive {i}", True)
+    script.script_tick(TICK)
+    last = f'"arguments": ["/fader/{{}}", {args.frames - 1}]'
+    stale = [i for i in range(args.clients)
+             if last.format(i) not in obs.obs_data_get_string(obs.get_source(f"Receive {i}").settings, "text")]
+    stats = core.visibility.stats()
+    script.script_unload()
+    return updates, tick_time / args.frames, stale, stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--visible", type=int, default=5)
+    parser.add_argument("--frames", type=int, default=600)
+    args = parser.parse_args()
+
+    print(f"{args.clients} receive sources, {args.visible} showing, {args.frames} frames of one message per source")
+    print(f"{'mode':<8} {'source updates':>15} {'tick ms':>8} {'stale after show':>17}")
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        import osc_io_textSource as script
+    failed = False
+    for mode in ("always", "showing"):
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            updates, tick, stale, stats = run(script, args, mode)
+        print(f"{mode:<8} {updates:>15,} {tick * 1000:>8.3f} {len(stale):>17}")
+        failed = failed or bool(stale)
+    print(f"visibility counters: {stats}")
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,426 @@
+"""
+Fake ``obspython`` module for running the OSC IO scripts outside OBS.
+
+Benchmarks put the ``benchmarks`` folder first on ``sys.path`` (which Python
+does automatically for ``python benchmarks/<script>.py``), so the scripts'
+``import obspython as obs`` picks up this module. It implements the parts of
+the OBS API the scripts use, keeps sources in memory, emits source and global
+signals, and counts every API call in ``calls``. A callback set with
+``set_recorder`` also sees every source update, proc call and signal.
+
+Property (UI) functions and ``OBS_*`` constants are accepted and ignored.
+"""
+
+import collections
+import json
+import threading
+
+calls = collections.Counter()  # API function name -> number of calls
+
+_sources = {}  # name -> Source
+_timers = []  # [callback, interval ms, ms until due]
+_lock = threading.RLock()
+_recorder = None  # callable(kind, source, data) or None
+
+
+def _counted(func):
+    name = func.__name__
+
+    def wrapper(*args, **kwargs):
+        calls[name] += 1
+        return func(*args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
+# --- fake OBS objects ---------------------------------------------------------
+
+class Data:
+    """``obs_data_t``: a settings object with values and defaults."""
+
+    def __init__(self, values=None):
+        self.values = dict(values or {})
+        self.defaults = {}
+
+    def get(self, name, fallback):
+        return self.values.get(name, self.defaults.get(name, fallback))
+
+
+class SignalHandler:
+    def __init__(self, source=None):
+        self.source = source
+        self.callbacks = collections.defaultdict(list)
+
+    def emit(self, signal, calldata):
+        if _recorder is not None:
+            _recorder("signal", self.source, signal)
+        for callback in list(self.callbacks[signal]):
+            callback(calldata)
+
+
+class ProcHandler:
+    def __init__(self, source=None):
+        self.source = source
+        self.calls = []  # (proc name, {calldata values}) in call order
+
+
+class Source:
+    def __init__(self, name, source_id, settings):
+        self.name = name
+        self.id = source_id
+        self.settings = Data(settings)
+        self.signal_handler = SignalHandler(self)
+        self.proc_handler = ProcHandler(self)
+        self.removed = False
+        self.updates = 0
+        self.showing = True  # in program, preview or a projector
+        self.active = True  # in program
+
+
+class WeakSource:
+    def __init__(self, source):
+        self.source = source
+
+
+class Calldata(dict):
+    pass
+
+
+_global_signal_handler = SignalHandler()
+
+
+# --- helpers for benchmarks (not part of the OBS API) -------------------------
+
+def create_source(name, source_id="text_ft2_source", settings=None):
+    """Adds a source and emits ``source_create``."""
+    with _lock:
+        source = _sources[name] = Source(name, source_id, settings)
+    _global_signal_handler.emit("source_create", Calldata(source=source))
+    return source
+
+
+def rename_source(old_name, new_name):
+    """Renames a source and emits ``source_rename``."""
+    with _lock:
+        source = _sources.pop(old_name)
+        source.name = new_name
+        _sources[new_name] = source
+    _global_signal_handler.emit("source_rename", Calldata(source=source, prev_name=old_name, new_name=new_name))
+
+
+def remove_source(name):
+    """Removes a source and emits ``source_destroy``."""
+    with _lock:
+        source = _sources.pop(name)
+        source.removed = True
+    _global_signal_handler.emit("source_destroy", Calldata(source=source))
+
+
+def get_source(name):
+    """Returns the fake source object for inspection."""
+    return _sources.get(name)
+
+
+def set_source_visibility(name, showing, active=None):
+    """
+    Shows or hides a source, and makes it (in)active in program, emitting
+    ``show``/``hide`` and ``activate``/``deactivate`` for every change. An
+    active source is always showing; ``active`` defaults to ``showing``.
+    """
+    source = _sources[name]
+    active = showing if active is None else active
+    changes = []
+    if source.showing != (showing or active):
+        source.showing = showing or active
+        changes.append("show" if source.showing else "hide")
+    if source.active != active:
+        source.active = active
+        changes.append("activate" if active else "deactivate")
+    for signal in changes:
+        source.signal_handler.emit(signal, Calldata(source=source))
+
+
+def run_timers(elapsed_ms):
+    """Calls every ``timer_add`` callback that is due after ``elapsed_ms``."""
+    for timer in list(_timers):
+        timer[2] -= elapsed_ms
+        while timer[2] <= 0 and timer in _timers:
+            timer[2] += timer[1]
+            timer[0]()
+
+
+def set_recorder(callback):
+    """
+    Calls ``callback(kind, source, data)`` for every ``"update"`` (data: the
+    new settings values), ``"proc"`` (data: ``(proc name, calldata values)``)
+    and ``"signal"`` (data: signal name; source is None for global signals).
+    Pass None to stop recording.
+    """
+    global _recorder
+    _recorder = callback
+
+
+def reset():
+    """Removes all sources, timers, signal connections, call counts and the recorder."""
+    global _recorder
+    with _lock:
+        _sources.clear()
+    _timers.clear()
+    _global_signal_handler.callbacks.clear()
+    calls.clear()
+    _recorder = None
+
+
+# --- sources ------------------------------------------------------------------
+
+@_counted
+def obs_get_source_by_name(name):
+    with _lock:
+        return _sources.get(name)
+
+
+@_counted
+def obs_source_release(source):
+    pass
+
+
+@_counted
+def obs_source_get_name(source):
+    return source.name if source is not None else None
+
+
+@_counted
+def obs_source_get_type(source):
+    return OBS_SOURCE_TYPE_INPUT
+
+
+@_counted
+def obs_source_get_unversioned_id(source):
+    return source.id
+
+
+@_counted
+def obs_source_get_settings(source):
+    return source.settings
+
+
+@_counted
+def obs_source_update(source, settings):
+    source.settings.values.update(settings.values)
+    source.updates += 1
+    if _recorder is not None:
+        _recorder("update", source, settings.values)
+    source.signal_handler.emit("update", Calldata(source=source))
+
+
+@_counted
+def obs_source_showing(source):
+    return source.showing
+
+
+@_counted
+def obs_source_active(source):
+    return source.active
+
+
+@_counted
+def obs_source_get_signal_handler(source):
+    return source.signal_handler
+
+
+@_counted
+def obs_source_get_proc_handler(source):
+    return source.proc_handler
+
+
+@_counted
+def obs_source_get_weak_source(source):
+    return WeakSource(source)
+
+
+@_counted
+def obs_weak_source_get_source(weak_source):
+    source = weak_source.source
+    return None if source.removed else source
+
+
+@_counted
+def obs_weak_source_release(weak_source):
+    pass
+
+
+@_counted
+def obs_enum_sources():
+    with _lock:
+        return list(_sources.values())
+
+
+@_counted
+def source_list_release(sources):
+    pass
+
+
+# --- signals, procs and calldata ----------------------------------------------
+
+@_counted
+def obs_get_signal_handler():
+    return _global_signal_handler
+
+
+@_counted
+def signal_handler_connect(handler, signal, callback):
+    handler.callbacks[signal].append(callback)
+
+
+@_counted
+def signal_handler_disconnect(handler, signal, callback):
+    if callback in handler.callbacks[signal]:
+        handler.callbacks[signal].remove(callback)
+
+
+@_counted
+def proc_handler_call(handler, name, calldata):
+    handler.calls.append((name, dict(calldata)))
+    if _recorder is not None:
+        _recorder("proc", handler.source, (name, dict(calldata)))
+    return True
+
+
+@_counted
+def calldata_create():
+    return Calldata()
+
+
+@_counted
+def calldata_destroy(calldata):
+    pass
+
+
+@_counted
+def calldata_set_string(calldata, name, value):
+    calldata[name] = value
+
+
+@_counted
+def calldata_string(calldata, name):
+    return calldata.get(name)
+
+
+@_counted
+def calldata_source(calldata, name):
+    return calldata.get(name)
+
+
+# --- settings -----------------------------------------------------------------
+
+@_counted
+def obs_data_create():
+    return Data()
+
+
+@_counted
+def obs_data_create_from_json(text):
+    return Data(json.loads(text))
+
+
+@_counted
+def obs_data_release(data):
+    pass
+
+
+@_counted
+def obs_data_get_json(data):
+    if data is None:
+        return "{}"
+    return json.dumps({**data.defaults, **data.values})
+
+
+def _setter(kind):
+    def setter(data, name, value):
+        data.values[name] = value
+    setter.__name__ = f"obs_data_set_{kind}"
+    return _counted(setter)
+
+
+def _default_setter(kind):
+    def setter(data, name, value):
+        data.defaults[name] = value
+    setter.__name__ = f"obs_data_set_default_{kind}"
+    return _counted(setter)
+
+
+def _getter(kind, fallback):
+    def getter(data, name):
+        return data.get(name, fallback)
+    getter.__name__ = f"obs_data_get_{kind}"
+    return _counted(getter)
+
+
+obs_data_set_string = _setter("string")
+obs_data_set_int = _setter("int")
+obs_data_set_bool = _setter("bool")
+obs_data_set_double = _setter("double")
+obs_data_set_default_string = _default_setter("string")
+obs_data_set_default_int = _default_setter("int")
+obs_data_set_default_bool = _default_setter("bool")
+obs_data_set_default_double = _default_setter("double")
+obs_data_get_string = _getter("string", "")
+obs_data_get_int = _getter("int", 0)
+obs_data_get_bool = _getter("bool", False)
+obs_data_get_double = _getter("double", 0.0)
+
+
+@_counted
+def obs_data_get_array(data, name):
+    return data.get(name, None)
+
+
+@_counted
+def obs_data_array_count(array):
+    return len(array) if array is not None else 0
+
+
+@_counted
+def obs_data_array_item(array, index):
+    item = array[index]
+    return item if isinstance(item, Data) else Data({"value": item})
+
+
+@_counted
+def obs_data_array_release(array):
+    pass
+
+
+# --- timers -------------------------------------------------------------------
+
+@_counted
+def timer_add(callback, milliseconds):
+    _timers.append([callback, milliseconds, milliseconds])
+
+
+@_counted
+def timer_remove(callback):
+    _timers[:] = [timer for timer in _timers if timer[0] != callback]
+
+
+# --- properties (UI) and constants ----------------------------------------------
+
+OBS_SOURCE_TYPE_INPUT = 0
+
+
+class _Property:
+    pass
+
+
+def _ignored(*args, **kwargs):
+    return _Property()
+
+
+def __getattr__(name):
+    if name.startswith("OBS_"):
+        return 0
+    if name.startswith(("obs_properties_", "obs_property_")):
+        return _ignored
+    raise AttributeError(f"fake obspython has no attribute '{name}'")
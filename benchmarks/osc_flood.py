@@ -0,0 +1,85 @@
+"""
+Local UDP OSC flood generator.
+
+Sends OSC messages to a server at a fixed rate (or as fast as possible). Each
+message carries its send time as a double precision argument so a receiver can
+measure end-to-end latency with ``time.time() - args[-1]``.
+
+Addresses are picked according to a distribution:
+
+* ``sequential``: round robin over all addresses,
+* ``uniform``: random, every address equally likely,
+* ``zipf``: random, address N is 1/N as likely as the first (a few hot faders).
+
+Run from the repository root::
+
+    python benchmarks/osc_flood.py --port 12345 --rate 2000 --count 10000 --addresses 50 --distribution zipf
+"""
+
+import argparse
+import random
+import socket
+import time
+
+from pythonosc import osc_message_builder
+
+DISTRIBUTIONS = ["sequential", "uniform", "zipf"]
+
+
+def build_message(address, value, sent_at):
+    builder = osc_message_builder.OscMessageBuilder(address=address)
+    builder.add_arg(value)
+    builder.add_arg(sent_at, "d")
+    return builder.build().dgram
+
+
+def pick_addresses(addresses, count, distribution="sequential", seed=1):
+    """Returns the address of each of ``count`` messages."""
+    if distribution == "sequential":
+        return [addresses[i % len(addresses)] for i in range(count)]
+    rng = random.Random(seed)
+    if distribution == "uniform":
+        return rng.choices(addresses, k=count)
+    if distribution == "zipf":
+        return rng.choices(addresses, weights=[1 / n for n in range(1, len(addresses) + 1)], k=count)
+    raise ValueError(f"Unknown distribution '{distribution}'")
+
+
+def flood(host, port, count, rate=0, addresses=("/bench/fader/1",), distribution="sequential"):
+    """
+    Sends ``count`` messages to ``addresses`` picked by ``distribution``.
+    ``rate`` is in messages per second; 0 sends as fast as possible. Returns
+    the elapsed time.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    picked = pick_addresses(list(addresses), count, distribution)
+    interval = 1.0 / rate if rate else 0.0
+    start = time.perf_counter()
+    for i in range(count):
+        if interval:
+            delay = start + i * interval - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        sock.sendto(build_message(picked[i], i, time.time()), (host, port))
+    elapsed = time.perf_counter() - start
+    sock.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12345)
+    parser.add_argument("--count", type=int, default=10000)
+    parser.add_argument("--rate", type=int, default=0, help="messages per second, 0 = unlimited")
+    parser.add_argument("--addresses", type=int, default=1, help="number of distinct /bench/fader/N addresses")
+    parser.add_argument("--distribution", choices=DISTRIBUTIONS, default="sequential")
+    args = parser.parse_args()
+
+    addresses = [f"/bench/fader/{n}" for n in range(1, args.addresses + 1)]
+    elapsed = flood(args.host, args.port, args.count, args.rate, addresses, args.distribution)
+    print(f"sent {args.count} messages in {elapsed:.2f} s ({args.count / elapsed:,.0f} msgs/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Replays an OSC IO recording over UDP.
+
+Sends the received packets of a recording made with the Record and Replay
+group (``osc_io_recorder``) to a server, with the original timing, scaled, or
+as fast as possible, so captured show traffic can be used as a load test.
+
+Run from the repository root::
+
+    python benchmarks/osc_replay.py show.oscrec --port 12345 --speed 4
+"""
+
+import argparse
+import os
+import socket
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from osc_io_recorder import OscRecording, replay
+
+
+class UdpTarget:
+    """Sends replayed packets to ``host:port`` instead of dispatching them."""
+
+    def __init__(self, host, port):
+        self.address = (host, port)
+        self.socket = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_DGRAM)
+
+    def call_handlers_for_packet(self, data, client_address):
+        self.socket.sendto(data, self.address)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=12345)
+    parser.add_argument("--speed", type=float, default=1.0, help="timing scale, 0 = as fast as possible")
+    parser.add_argument("--start", type=float, default=0.0, help="seconds into the recording to start at")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    recording = OscRecording(args.recording)
+    target = UdpTarget(args.host, args.port)
+    print(f"{args.recording}: {recording.duration():.2f} s")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        count = replay(recording, target, args.speed, args.start)
+        elapsed = time.perf_counter() - start
+        print(f"sent {count} packets in {elapsed:.2f} s ({count / max(elapsed, 1e-9):,.0f} msgs/s)")
+    target.socket.close()
+    recording.close()
+
+
+if __name__ == "__main__":
+    main()
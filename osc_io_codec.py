@@ -0,0 +1,143 @@
+"""
+OSC IO: Payload Codec
+=====================
+
+Encodes received OSC messages into the text a source receives, and decodes the
+text of send sources back into an OSC address and arguments.
+
+Two formats are supported:
+
+* ``json``: ``{"address": ..., "arguments": [...]}``, byte for byte what
+  ``json.dumps`` produces. The ``"address"`` prefix is cached per value, and
+  arguments made of ints, floats and strings are written with a ``%`` format
+  template cached per argument type shape, so the general JSON encoder only
+  runs for other argument types.
+* ``compact``: a positional JSON array, ``["/osc/address", arg1, arg2]``, without
+  the sender address. It is shorter to build and parse; ``osc_monitor.html``
+  reads both formats.
+
+``decode`` accepts either format, and skips parsing when a source's text is the
+same as the last time it was decoded.
+"""
+
+import json
+import math
+from json.encoder import encode_basestring_ascii
+
+PAYLOAD_FORMATS = [
+    ("JSON Object", "json"),
+    ("Compact (positional array)", "compact"),
+]
+
+MAX_CACHED_PREFIXES = 1024
+MAX_CACHED_TEMPLATES = 256
+_TEMPLATE_FIELDS = {str: "%s", int: "%r", float: "%r"}
+
+
+def encode_argument(argument):
+    """Encodes one OSC argument as ``json.dumps`` would."""
+    kind = type(argument)
+    if kind is str:
+        return encode_basestring_ascii(argument)
+    if kind is int:
+        return int.__repr__(argument)
+    if kind is float and math.isfinite(argument):
+        return float.__repr__(argument)
+    return json.dumps(argument)
+
+
+def build_template(shape):
+    """
+    Returns ``(format, string positions)`` for a tuple of argument types, or
+    None if a type has no template field (bools, blobs, lists, ...).
+    """
+    fields = []
+    strings = []
+    for i, kind in enumerate(shape):
+        field = _TEMPLATE_FIELDS.get(kind)
+        if field is None:
+            return None
+        if kind is str:
+            strings.append(i)
+        fields.append(field)
+    return ", ".join(fields), tuple(strings)
+
+
+class PayloadCodec:
+    """Encoder and decoder for one payload format."""
+
+    def __init__(self, format="json"):
+        self.format = format
+        self._prefixes = {}  # address -> '{"address": <address>, "arguments": ['
+        self._templates = {}  # argument types -> build_template() result
+        self._decoded = {}  # key -> (text, (address, arguments))
+
+    def configure(self, format):
+        if format not in [value for _, value in PAYLOAD_FORMATS]:
+            raise ValueError(f"Unknown payload format '{format}'")
+        self.format = format
+
+    def encode(self, address, args):
+        """
+        Returns the payload for a message received from ``address`` (the
+        sender, as passed to the dispatcher handler) with ``args`` (the OSC
+        address followed by the OSC arguments).
+        """
+        arguments = self.encode_arguments(args)
+        if self.format == "compact":
+            return f"[{arguments}]"
+        prefix = self._prefixes.get(address)
+        if prefix is None:
+            if len(self._prefixes) >= MAX_CACHED_PREFIXES:
+                self._prefixes.clear()
+            prefix = self._prefixes[address] = '{"address": ' + json.dumps(address) + ', "arguments": ['
+        return prefix + arguments + "]}"
+
+    def encode_arguments(self, args):
+        """Returns ``args`` as comma separated JSON values."""
+        shape = tuple(map(type, args))
+        template = self._templates.get(shape, False)
+        if template is False:
+            if len(self._templates) >= MAX_CACHED_TEMPLATES:
+                self._templates.clear()
+            template = self._templates[shape] = build_template(shape)
+        if template is not None:
+            format, strings = template
+            values = list(args)
+            for i in strings:
+                values[i] = encode_basestring_ascii(values[i])
+            text = format % tuple(values)
+            # repr() writes nan/inf where JSON wants NaN/Infinity
+            if "nan" not in text and "inf" not in text:
+                return text
+        return ", ".join(map(encode_argument, args))
+
+    def decode(self, text, key=None):
+        """
+        Returns ``(address, arguments)`` from a JSON object or positional array
+        payload. With a ``key`` (e.g. the source name) the result is reused
+        while the text does not change. Raises ``ValueError`` on bad JSON.
+        """
+        if key is not None:
+            cached = self._decoded.get(key)
+            if cached is not None and cached[0] == text:
+                return cached[1]
+
+        data = json.loads(text)
+        if isinstance(data, dict):
+            decoded = (data.get("address"), data.get("arguments"))
+        elif isinstance(data, list):
+            decoded = (data[0], data[1:]) if data else (None, None)
+        else:
+            raise ValueError("Payload must be a JSON object or array")
+
+        if key is not None:
+            self._decoded[key] = (text, decoded)
+        return decoded
+
+    def forget(self, key=None):
+        """Drops the cached decode result for ``key``, or for every key."""
+        if key is None:
+            self._decoded.clear()
+        else:
+            self._decoded.pop(key, None)
@@ -0,0 +1,1151 @@
+"""
+OSC IO: Core
+============
+
+The OSC engine shared by the OBS scripts. OBS loads every Python script into
+the same interpreter, so this module exists once per OBS process and holds
+everything that does not depend on where received OSC goes:
+
+* one OSC server, started with the settings of the script that starts it,
+* one routing table over the clients of every loaded script,
+* one receive queue, drained once per frame,
+* the senders, send filter, codec, metrics, log, recorder and stats endpoint.
+
+``osc_io_textSource`` and ``osc_io_browserSource`` are thin adapters: each
+subclasses ``Sink`` to say how a received message is applied, registers an
+instance with ``load`` and forwards its ``script_*`` functions here. Settings
+shared by the scripts (queue, send, metrics and logging) follow the script
+whose settings were applied last.
+
+Received datagrams are parsed by ``osc_io_ingest``. python-osc is only
+imported when the first message is sent, by the asyncio and thread per packet
+server engines, or for unusual argument types, which keeps loading the scripts
+in OBS fast.
+"""
+
+import collections
+import json
+import math
+import socket
+import time
+
+import obspython as obs
+
+from osc_io_codec import PAYLOAD_FORMATS, PayloadCodec
+from osc_io_ingest import OscIngest
+from osc_io_log import LOG_LEVELS, RateLimitedLog
+from osc_io_mappings import load_mappings_file, parse_mappings
+from osc_io_metrics import Metrics, StatsServer
+from osc_io_queue import ReceiveQueue
+from osc_io_recorder import SENT, OscRecorder, RecordingDispatcher, Replayer
+from osc_io_routing import RoutingTable, check_pattern
+from osc_io_senders import OutboundBatcher, SendFilter, SenderPool, SendWorker, build_message, parse_group
+from osc_io_server import SERVER_ENGINES, ListenerGroup, parse_listener
+from osc_io_sources import VISIBILITY_MODES, SourceCache, VisibilityTracker, index_clients
+
+# Defaults
+DEFAULT_SERVER_IP = "127.0.0.1"
+DEFAULT_SERVER_PORT = 12345
+DEFAULT_SHOW_CLIENTS_SOURCE = "Client Settings Output"
+DEFAULT_SERVER_ENGINE = "single"
+DEFAULT_MAPPING_MODE = "manual"
+DEFAULT_SEND_BATCH_WINDOW_MS = 0  # 0 = flush once per OBS video frame
+DEFAULT_SEND_QUEUE_SIZE = 4096
+DEFAULT_SEND_BACKLOG = 256  # messages queued per client destination
+DEFAULT_SEND_OVERFLOW_POLICY = "drop_oldest"
+DEFAULT_SEND_RETRIES = 0
+DEFAULT_RECEIVE_QUEUE_SIZE = 1024
+DEFAULT_RECEIVE_OVERFLOW_POLICY = "drop_oldest"
+DEFAULT_RECEIVE_BATCH_SIZE = 256  # messages applied per OBS tick, 0 = all
+DEFAULT_RECEIVE_VISIBILITY = "always"
+DEFAULT_PAYLOAD_FORMAT = "json"
+DEFAULT_STATS_HTTP_PORT = 0  # 0 = no HTTP stats endpoint
+DEFAULT_LOG_LEVEL = "warning"
+DEFAULT_LOG_INTERVAL = 1  # seconds between summaries of repeated messages
+DEFAULT_REPLAY_SPEED = 1.0  # 0 = as fast as possible
+SEND_OVERFLOW_POLICIES = [
+    ("Drop Oldest", "drop_oldest"),
+    ("Drop Newest", "drop_newest"),
+]
+RECEIVE_OVERFLOW_POLICIES = [
+    ("Drop Oldest", "drop_oldest"),
+    ("Drop Newest", "drop_newest"),
+    ("Coalesce by Address", "coalesce"),
+]
+MAX_CLIENTS = 1000
+CLIENTS_PER_PAGE = 10
+MAPPING_MODES = [
+    ("Manual", "manual"),
+    ("Mapping File (JSON/CSV)", "file"),
+    ("Client Settings Text Source", "text_source"),
+]
+CLIENT_FIELDS = {  # columns accepted from bulk mapping tables by every sink, with their defaults
+    "text_source_send_name": "",
+    "send_interval_ms": "",  # empty = Minimum Send Interval setting
+}
+TEXT_SOURCE_IDS = ["text_gdiplus", "text_ft2_source"]
+
+# Global variables
+sinks = ()  # loaded scripts, in load order; replaced, never mutated, so the server thread can iterate it
+router = RoutingTable()  # OSC address lookup built from the clients of every sink
+send_index = {}  # text source send name -> clients, for the signal callback
+send_sources = set()  # send source names whose update signal is connected
+source_cache = SourceCache()  # receive sources resolved by name
+visibility = VisibilityTracker(source_cache)  # holds updates to receive sources nobody sees
+senders = SenderPool()  # one persistent UDP sender per client destination
+send_batching = False
+send_batch_window_ms = DEFAULT_SEND_BATCH_WINDOW_MS
+flush_timer_added = False
+send_filter = SendFilter()  # skips unchanged send source text, holds messages within the send interval
+send_skip_unchanged = True
+send_interval_ms = 0
+receive_queue = ReceiveQueue(DEFAULT_RECEIVE_QUEUE_SIZE, DEFAULT_RECEIVE_OVERFLOW_POLICY)  # server thread -> OBS tick
+receive_batch_size = DEFAULT_RECEIVE_BATCH_SIZE
+no_coalesce_router = RoutingTable()  # trigger addresses that must never be coalesced
+codec = PayloadCodec(DEFAULT_PAYLOAD_FORMAT)  # received OSC -> source payload, send source text -> OSC
+listeners = ListenerGroup()  # one OSC server per listening ip:port
+server_running = False  # at least one listener is bound and serving
+osc_dispatcher = None  # dispatcher of the running server
+ingest = None  # its lazy datagram parser
+needs_reconnect = False  # OBS signal connections were dropped with an unloaded script
+metrics = Metrics()  # pipeline counters and latencies, off unless enabled in the UI
+stats_server = StatsServer(metrics)  # optional local HTTP/JSON view of the metrics
+stats_http_port = DEFAULT_STATS_HTTP_PORT
+stats_osc = False  # answer /osc_io/stats requests
+log = RateLimitedLog(DEFAULT_LOG_LEVEL, DEFAULT_LOG_INTERVAL)  # packet path logging, written off-thread
+recorder = OscRecorder()  # raw received (and optionally sent) packets to a file
+record_outgoing = False
+replayer = Replayer()  # plays a recording back into the server's dispatcher
+batcher = OutboundBatcher(senders, metrics=metrics, log=log)  # optional bundling of outgoing messages
+send_worker = SendWorker(senders, batcher, metrics, log)  # sends outgoing messages off the OBS thread
+metrics.providers.update({
+    "receive_queue": lambda: dict(receive_queue.counters),
+    "listeners": lambda: listeners.stats(),
+    "senders": lambda: {f"{ip}:{port}": counters for (ip, port), counters in senders.stats().items()},
+    "send_batcher": lambda: dict(batcher.counters),
+    "send_worker": lambda: send_worker.stats(),
+    "source_cache": lambda: dict(source_cache.counters),
+    "visibility": lambda: visibility.stats(),
+    "send_filter": lambda: dict(send_filter.counters),
+    "log": lambda: dict(log.counters),
+    "ingest": lambda: dict(ingest.counters) if ingest is not None else {},
+    "recorder": lambda: dict(recorder.counters),
+})
+
+
+class Sink:
+    """
+    Where received OSC goes. A script subclasses this, overriding ``apply``
+    and the hooks it needs, and passes its instance to the functions below.
+    """
+
+    name = ""
+    receive_field = ""  # client key naming the receiving source
+    client_fields = {}  # mapping table columns of this sink, with their defaults
+    receives_unmatched = False  # ``targets`` has somewhere to put messages no client matched
+
+    def __init__(self):
+        self.settings = None  # a pointer to the obs settings of the script
+        self.clients = []
+        self.mapping_errors = []  # rows rejected by the last bulk load
+        self.shown_client_properties = []  # names of the client properties on the current page
+
+    def configure(self, settings):
+        """Reads sink specific settings. Called on load and whenever the settings change."""
+
+    def read_client(self, settings, index, client):
+        """Adds the receive fields of manual client ``index`` to ``client``."""
+        client[self.receive_field] = obs.obs_data_get_string(settings, f"{self.receive_field}_{index}")
+
+    def targets(self, clients):
+        """
+        Returns where a message goes, given this sink's clients that matched
+        it. ``clients`` is only empty when no client of any sink matched.
+        """
+        return clients
+
+    def target_key(self, target):
+        """Returns what identifies a target's destination; messages are coalesced per key and address."""
+        return target[self.receive_field]
+
+    def source_name(self, target):
+        """Returns the name of the OBS source a target updates, for visibility tracking."""
+        return target[self.receive_field]
+
+    def apply(self, target, address, args):
+        """Applies one received message to a target. Runs on the OBS side."""
+        raise NotImplementedError
+
+    def flush(self):
+        """Called after each frame's messages were applied."""
+
+    def server_started(self):
+        """Called when the OSC server starts, or when the sink loads while it runs."""
+
+    def server_stopped(self):
+        """Called when the OSC server stops, or when the sink unloads."""
+
+    def add_server_properties(self, group):  # UI
+        """Adds sink specific properties to the OSC Server Settings group."""
+
+    def add_client_properties(self, group, index):  # UI
+        """Adds the receive properties of manual client ``index``."""
+
+
+def bind(callback, sink):
+    """Returns an OBS property callback that calls ``callback(sink, ...)``."""
+    return lambda *args: callback(sink, *args)
+
+
+def defaults(settings):
+    obs.obs_data_set_default_string(settings, "server_ip", DEFAULT_SERVER_IP)
+    obs.obs_data_set_default_int(settings, "server_port", DEFAULT_SERVER_PORT)
+    obs.obs_data_set_default_string(settings, "text_source_settings", DEFAULT_SHOW_CLIENTS_SOURCE)
+    obs.obs_data_set_default_string(settings, "server_engine", DEFAULT_SERVER_ENGINE)
+    obs.obs_data_set_default_bool(settings, "server_reuse_address", True)
+    obs.obs_data_set_default_string(settings, "mapping_mode", DEFAULT_MAPPING_MODE)
+    obs.obs_data_set_default_int(settings, "client_page", 1)
+    obs.obs_data_set_default_int(settings, "send_batch_window_ms", DEFAULT_SEND_BATCH_WINDOW_MS)
+    obs.obs_data_set_default_bool(settings, "send_skip_unchanged", True)
+    obs.obs_data_set_default_int(settings, "send_queue_size", DEFAULT_SEND_QUEUE_SIZE)
+    obs.obs_data_set_default_int(settings, "send_backlog", DEFAULT_SEND_BACKLOG)
+    obs.obs_data_set_default_string(settings, "send_overflow_policy", DEFAULT_SEND_OVERFLOW_POLICY)
+    obs.obs_data_set_default_int(settings, "send_retries", DEFAULT_SEND_RETRIES)
+    obs.obs_data_set_default_int(settings, "receive_queue_size", DEFAULT_RECEIVE_QUEUE_SIZE)
+    obs.obs_data_set_default_string(settings, "receive_overflow_policy", DEFAULT_RECEIVE_OVERFLOW_POLICY)
+    obs.obs_data_set_default_int(settings, "receive_batch_size", DEFAULT_RECEIVE_BATCH_SIZE)
+    obs.obs_data_set_default_string(settings, "receive_visibility", DEFAULT_RECEIVE_VISIBILITY)
+    obs.obs_data_set_default_string(settings, "payload_format", DEFAULT_PAYLOAD_FORMAT)
+    obs.obs_data_set_default_int(settings, "stats_http_port", DEFAULT_STATS_HTTP_PORT)
+    obs.obs_data_set_default_string(settings, "log_level", DEFAULT_LOG_LEVEL)
+    obs.obs_data_set_default_int(settings, "log_interval", DEFAULT_LOG_INTERVAL)
+    obs.obs_data_set_default_double(settings, "replay_speed", DEFAULT_REPLAY_SPEED)
+
+
+def load(sink, settings):
+    """
+    Registers ``sink`` (again, on reload), starts the OSC server if it is not
+    running, and loads the sink's clients into the shared routing table.
+    """
+    global sinks
+
+    sink.settings = settings
+    if sink not in sinks:
+        sinks = sinks + (sink,)
+
+    # Optionally start OSC server on load
+    start_osc_server(sink)
+    print("osc server started on script load")
+
+    source_cache.connect()
+    codec.forget()
+    send_filter.clear()
+    update(settings)
+    #load client list for OSC functions
+    reload(sink, settings)
+
+
+def reload(sink, settings):
+    """
+    Re-reads the clients of ``sink`` and applies only what changed, while the
+    server keeps receiving: the routing table is swapped in one assignment,
+    senders are opened and closed for added and removed destinations, and only
+    the update signals of added and removed send sources are (dis)connected.
+    Returns the number of clients added and removed.
+    """
+    sink.settings = settings
+    sink.configure(settings)
+    clients = load_clients(sink, settings)
+    old = collections.Counter(client_key(client) for client in sink.clients)
+    new = collections.Counter(client_key(client) for client in clients)
+    added = sum((new - old).values())
+    removed = sum((old - new).values())
+    if not added and not removed:
+        return 0, 0
+
+    sink.clients = clients
+    all_clients = rebuild_routes()
+    senders.open(clients)
+    send_worker.retain(all_clients)
+    senders.retain(all_clients)
+    connect_send_sources()
+    if old:
+        print(f"Reloaded client mappings: {added} added, {removed} removed")
+    return added, removed
+
+
+def client_key(client):
+    """Returns a hashable copy of a client, for comparing client lists."""
+    return tuple(sorted(client.items()))
+
+
+def update(settings):
+    """Applies the settings shared by every sink."""
+    configure_outbound(settings)
+    configure_receive(settings)
+    configure_metrics(settings)
+    configure_recording(settings)
+
+
+def rebuild_routes():
+    """Rebuilds the routing table and send index from the clients of every sink and returns those clients."""
+    global router, send_index
+
+    clients = [client for sink in sinks for client in sink.clients]
+    # Build the routing table once; swapping the reference keeps lookups on the server thread consistent
+    router = RoutingTable(clients)
+    send_index = index_clients(clients, "text_source_send_name")
+    return clients
+
+
+def connect_send_sources():
+    """Connects the update signal of every send source in use and disconnects the rest."""
+    for source_name in list(send_sources):
+        if source_name not in send_index:
+            disconnect_send_source(source_name)
+
+    # Attach signal handlers to text sources
+    for source_name in send_index:
+        if source_name in send_sources:
+            continue
+        source = obs.obs_get_source_by_name(source_name)
+        if source:
+            signal_handler = obs.obs_source_get_signal_handler(source)
+            obs.signal_handler_connect(signal_handler,"update", source_signal_callback)
+            obs.obs_source_release(source)
+            send_sources.add(source_name)
+        else:
+            print(f"Source {source_name} not found for signal handler.")
+
+
+def disconnect_send_source(source_name):
+    send_sources.discard(source_name)
+    try:
+        source = obs.obs_get_source_by_name(source_name)
+        if source:
+            handler = obs.obs_source_get_signal_handler(source)
+            obs.signal_handler_disconnect(handler, "update", source_signal_callback)
+            obs.obs_source_release(source)
+    except Exception as e:
+        print("no source signal to remove")
+
+
+def load_clients(sink, settings):
+    """
+    Reads the client list from the configured mapping mode: the per-client
+    properties, a JSON/CSV mapping file, or the Client Settings Text Source.
+    Every client is tagged with the name of its sink.
+    """
+    fields = dict(sink.client_fields, **CLIENT_FIELDS)
+    mode = obs.obs_data_get_string(settings, "mapping_mode") or DEFAULT_MAPPING_MODE
+    if mode == "file":
+        path = obs.obs_data_get_string(settings, "mapping_file")
+        loaded, sink.mapping_errors = load_mappings_file(path, fields)
+    elif mode == "text_source":
+        source_name = obs.obs_data_get_string(settings, "text_source_settings")
+        loaded, sink.mapping_errors = parse_mappings(get_source_text(source_name), fields)
+    else:
+        loaded, sink.mapping_errors = [], []
+        for i in range(obs.obs_data_get_int(settings, "number_of_clients")):
+            client_ip = obs.obs_data_get_string(settings, f"client_ip_{i}")
+
+            if client_ip: #Only create the client data, if there is an IP
+                client_data = {
+                    "client_ip": client_ip,
+                    "client_port": obs.obs_data_get_int(settings, f"client_port_{i}"),
+                    "text_source_send_name": obs.obs_data_get_string(settings, f"text_source_send_{i}"),
+                    "osc_address": obs.obs_data_get_string(settings, f"osc_address_{i}"),
+                }
+                try:
+                    check_pattern(client_data["osc_address"])
+                except ValueError as e:
+                    sink.mapping_errors.append(f"Client {i + 1}: {e}")
+                    continue
+                sink.read_client(settings, i, client_data)
+                loaded.append(client_data)
+
+    for client in loaded:
+        client["sink"] = sink.name
+        interval = client.get("send_interval_ms")
+        client["send_interval_ms"] = int(interval) if interval and str(interval).isdigit() else None
+
+    for error in sink.mapping_errors:
+        print(f"Mapping error: {error}")
+    print(f"Loaded {len(loaded)} client mappings ({mode})")
+    return loaded
+
+
+def get_source_text(source_name):
+    """Returns the text setting of the named text source, or an empty string."""
+    text = ""
+    source = obs.obs_get_source_by_name(source_name)
+    if source is not None:
+        source_settings = obs.obs_source_get_settings(source)
+        text = obs.obs_data_get_string(source_settings, "text")
+        obs.obs_data_release(source_settings)
+        obs.obs_source_release(source)
+    return text
+
+
+def populate_list_property(list_property, allowed_ids):
+    sources = obs.obs_enum_sources()
+    if sources is not None:
+        for source in sources:
+            source_type = obs.obs_source_get_type(source)
+            if source_type == obs.OBS_SOURCE_TYPE_INPUT:
+                unversioned_id = obs.obs_source_get_unversioned_id(source)
+                if unversioned_id in allowed_ids:
+                    name = obs.obs_source_get_name(source)
+                    obs.obs_property_list_add_string(list_property, name, name)
+        obs.source_list_release(sources)
+
+
+def properties(sink): #UI
+    print(f"script properties {obs.obs_data_get_json(sink.settings)}")
+
+    props = obs.obs_properties_create()
+
+    server_group = obs.obs_properties_create()
+    obs.obs_properties_add_group(props, "server_group", "OSC Server Settings", obs.OBS_GROUP_NORMAL, server_group)
+
+    obs.obs_properties_add_text(server_group, "server_ip", "Server IP Address", obs.OBS_TEXT_DEFAULT)
+    obs.obs_properties_add_int(server_group, "server_port", "Server Port", 1, 65535, 1)
+    obs.obs_properties_add_int(server_group, "receive_buffer_kb", "Receive Buffer (KB, 0 = system default)", 0, 65536, 64)
+    reuse_address = obs.obs_properties_add_bool(server_group, "server_reuse_address", "Rebind Port on Restart")
+    obs.obs_property_set_long_description(reuse_address, "Sets SO_REUSEADDR, so a restarted server gets its port back even while an old socket on it is still open. Another program that also sets it can then bind the same port. Has no effect on Windows. Takes effect the next time the server starts.")
+    obs.obs_properties_add_text(server_group, "server_allow_list", "Allowed Senders (comma separated IPs, empty = all)", obs.OBS_TEXT_DEFAULT)
+    extra_listeners = obs.obs_properties_add_editable_list(
+        server_group,
+        "extra_listeners",
+        "Additional Listeners",
+        obs.OBS_EDITABLE_LIST_TYPE_STRINGS,
+        None,
+        None
+        )
+    obs.obs_property_set_long_description(extra_listeners, "One listener per line: ip:port [rcvbuf=KB] [allow=ip,ip], e.g. 192.168.1.20:9001 rcvbuf=1024 allow=192.168.1.50")
+    server_engine = obs.obs_properties_add_list(
+        server_group,
+        "server_engine",
+        "Server Engine",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING
+        )
+    for label, value in SERVER_ENGINES:
+        obs.obs_property_list_add_string(server_engine, label, value)
+    obs.obs_property_set_long_description(server_engine, "Takes effect the next time the server starts.")
+    obs.obs_properties_add_int(server_group, "receive_queue_size", "Receive Queue Size", 16, 65536, 16)
+    overflow_policy = obs.obs_properties_add_list(
+        server_group,
+        "receive_overflow_policy",
+        "When Queue Is Full",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING
+        )
+    for label, value in RECEIVE_OVERFLOW_POLICIES:
+        obs.obs_property_list_add_string(overflow_policy, label, value)
+    obs.obs_properties_add_int(server_group, "receive_batch_size", "Messages Applied per Frame (0 = all)", 0, 65536, 1)
+    receive_visibility = obs.obs_properties_add_list(
+        server_group,
+        "receive_visibility",
+        "Update Receive Sources",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING
+        )
+    for label, value in VISIBILITY_MODES:
+        obs.obs_property_list_add_string(receive_visibility, label, value)
+    obs.obs_property_set_long_description(receive_visibility, "Sources that are not visible keep only the latest value per OSC address, up to Receive Queue Size messages each, and get them as soon as they become visible. Saves redrawing text in scenes nobody is looking at.")
+    obs.obs_properties_add_bool(server_group, "receive_coalesce", "Only Apply Latest Value per Source and Address")
+    no_coalesce = obs.obs_properties_add_text(server_group, "receive_no_coalesce", "Never Coalesce Addresses", obs.OBS_TEXT_DEFAULT)
+    obs.obs_property_set_long_description(no_coalesce, "Comma separated OSC addresses (wildcards allowed) for trigger messages that must always be applied, e.g. /cue/go, /button/*")
+    payload_format = obs.obs_properties_add_list(
+        server_group,
+        "payload_format",
+        "Receive Payload Format",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING
+        )
+    for label, value in PAYLOAD_FORMATS:
+        obs.obs_property_list_add_string(payload_format, label, value)
+    obs.obs_property_set_long_description(payload_format, 'JSON Object: {"address": [sender ip, port], "arguments": ["/osc/address", arg, ...]}. Compact: ["/osc/address", arg, ...]')
+    sink.add_server_properties(server_group)
+    obs.obs_properties_add_text(server_group, "server_status", server_status(), obs.OBS_TEXT_INFO)
+    obs.obs_properties_add_button(server_group, "start_server", "Start Server", bind(start_server_callback, sink))  # Add Start button
+    obs.obs_properties_add_button(server_group, "stop_server", "Stop Server", bind(stop_server_callback, sink))  # Add Stop button
+
+    send_group = obs.obs_properties_create()
+    obs.obs_properties_add_group(props, "send_group", "OSC Send Settings", obs.OBS_GROUP_NORMAL, send_group)
+
+    obs.obs_properties_add_bool(send_group, "send_batching", "Bundle Outgoing Messages")
+    batch_window = obs.obs_properties_add_int_slider(send_group, "send_batch_window_ms", "Bundle Window (ms, 0 = every frame)", 0, 16, 1)
+    obs.obs_property_set_long_description(batch_window, "Messages to the same client within this window are sent as one OSC bundle.")
+    obs.obs_properties_add_bool(send_group, "send_coalesce", "Only Send Latest Value per Address")
+    skip_unchanged = obs.obs_properties_add_bool(send_group, "send_skip_unchanged", "Skip Updates with Unchanged Text")
+    obs.obs_property_set_long_description(skip_unchanged, "OBS also signals an update when other properties of a text source change.")
+    send_interval = obs.obs_properties_add_int(send_group, "send_interval_ms", "Minimum Send Interval per Client (ms, 0 = off)", 0, 10000, 1)
+    obs.obs_property_set_long_description(send_interval, "Faster updates to the same client and address are held back and only the latest is sent. Mapping tables can set send_interval_ms per client.")
+    send_queue = obs.obs_properties_add_int(send_group, "send_queue_size", "Send Queue Size", 16, 65536, 16)
+    obs.obs_property_set_long_description(send_queue, "Messages are sent from a background thread. This limits the messages waiting to be sent to all clients together.")
+    obs.obs_properties_add_int(send_group, "send_backlog", "Send Queue Size per Client", 1, 65536, 1)
+    send_overflow = obs.obs_properties_add_list(
+        send_group,
+        "send_overflow_policy",
+        "When Send Queue Is Full",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING
+        )
+    for label, value in SEND_OVERFLOW_POLICIES:
+        obs.obs_property_list_add_string(send_overflow, label, value)
+    send_retries = obs.obs_properties_add_int(send_group, "send_retries", "Retries After a Send Error", 0, 10, 1)
+    obs.obs_property_set_long_description(send_retries, "A failed message is retried after 50 ms, then 100 ms, 200 ms and so on, while other clients keep being sent to.")
+    send_groups = obs.obs_properties_add_editable_list(
+        send_group,
+        "send_groups",
+        "Destination Groups",
+        obs.OBS_EDITABLE_LIST_TYPE_STRINGS,
+        None,
+        None
+        )
+    obs.obs_property_set_long_description(send_groups, "One group per line: name ip:port[,ip:port...] [ttl=N] [iface=ip], e.g. stage 239.1.2.3:9000 ttl=2 iface=192.168.1.20. A client with the IP @stage sends each message once to the whole group.")
+
+    metrics_group = obs.obs_properties_create()
+    obs.obs_properties_add_group(props, "metrics_group", "Metrics and Logging", obs.OBS_GROUP_NORMAL, metrics_group)
+
+    obs.obs_properties_add_bool(metrics_group, "metrics_enabled", "Collect Metrics")
+    stats_port = obs.obs_properties_add_int(metrics_group, "stats_http_port", "Stats HTTP Port (0 = off)", 0, 65535, 1)
+    obs.obs_property_set_long_description(stats_port, "Serves the metrics as JSON on http://127.0.0.1:<port>/stats")
+    stats_osc_prop = obs.obs_properties_add_bool(metrics_group, "stats_osc", "Answer /osc_io/stats Requests")
+    obs.obs_property_set_long_description(stats_osc_prop, "Replies with the metrics as a JSON string to the sender, or to the port given as the first argument.")
+    obs.obs_properties_add_text(metrics_group, "metrics_summary", metrics.summary(), obs.OBS_TEXT_INFO)
+    obs.obs_properties_add_button(metrics_group, "refresh_metrics", "Refresh Stats", bind(refresh_metrics_callback, sink))
+    obs.obs_properties_add_button(metrics_group, "reset_metrics", "Reset Stats", bind(reset_metrics_callback, sink))
+
+    log_level = obs.obs_properties_add_list(
+        metrics_group,
+        "log_level",
+        "Log Level",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING
+        )
+    for label, value in LOG_LEVELS:
+        obs.obs_property_list_add_string(log_level, label, value)
+    log_interval = obs.obs_properties_add_int(metrics_group, "log_interval", "Summarise Repeated Messages Every (s)", 1, 60, 1)
+    obs.obs_property_set_long_description(log_interval, "Repeated messages about the same source or client are logged once per interval, followed by a count.")
+
+    record_group = obs.obs_properties_create()
+    obs.obs_properties_add_group(props, "record_group", "Record and Replay", obs.OBS_GROUP_NORMAL, record_group)
+
+    obs.obs_properties_add_path(record_group, "record_file", "Recording File", obs.OBS_PATH_FILE_SAVE, "OSC recordings (*.oscrec)", None)
+    obs.obs_properties_add_bool(record_group, "record_outgoing", "Also Record Sent Messages")
+    obs.obs_properties_add_button(record_group, "start_recording", "Start Recording", bind(start_recording_callback, sink))
+    obs.obs_properties_add_button(record_group, "stop_recording", "Stop Recording", bind(stop_recording_callback, sink))
+    replay_speed = obs.obs_properties_add_float(record_group, "replay_speed", "Replay Speed (0 = as fast as possible)", 0, 100, 0.1)
+    obs.obs_property_set_long_description(replay_speed, "Received messages in the recording are fed to the running server with their original timing scaled by this factor.")
+    obs.obs_properties_add_button(record_group, "start_replay", "Replay", bind(start_replay_callback, sink))
+    obs.obs_properties_add_button(record_group, "stop_replay", "Stop Replay", bind(stop_replay_callback, sink))
+
+    mapping_mode = obs.obs_properties_add_list(
+        props,
+        "mapping_mode",
+        "Client Mappings",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING
+        )
+    for label, value in MAPPING_MODES:
+        obs.obs_property_list_add_string(mapping_mode, label, value)
+    obs.obs_property_set_modified_callback(mapping_mode, bind(client_count_callback, sink))
+
+    obs.obs_properties_add_path(props, "mapping_file", "Mapping File", obs.OBS_PATH_FILE, "Mapping tables (*.json *.csv)", None)
+    obs.obs_properties_add_text(props, "mapping_summary", "", obs.OBS_TEXT_INFO)
+    reload_mappings = obs.obs_properties_add_button(props, "reload_mappings", "Reload Mappings", bind(reload_mappings_callback, sink))
+    obs.obs_property_set_long_description(reload_mappings, "Re-reads the mapping file or Client Settings Text Source. Changes made in the script properties apply right away.")
+
+    client_count = obs.obs_properties_add_int(props, "number_of_clients", "Number of Clients", 0, MAX_CLIENTS, 1)
+    #modified call back
+    obs.obs_property_set_modified_callback(client_count, bind(client_count_callback, sink))
+
+    client_page = obs.obs_properties_add_int(props, "client_page", "Client Page", 1, 1, 1)
+    obs.obs_property_set_modified_callback(client_page, bind(client_count_callback, sink))
+
+    setting_source = obs.obs_properties_add_list(
+        props,
+        "text_source_settings",
+        "Client Settings Text Source",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING
+        )
+    populate_list_property(setting_source, TEXT_SOURCE_IDS)
+
+    show_client_page(sink, props, sink.settings)
+
+    return props
+
+
+def reload_mappings_callback(sink, props, property):  # UI
+    reload(sink, sink.settings)
+    show_client_page(sink, props, sink.settings)
+    return True
+
+
+def client_count_callback(sink, props, prop, settings):  # UI
+    show_client_page(sink, props, settings)
+    return True
+
+
+def show_client_page(sink, props, settings): # UI
+    """
+    Shows one page of clients instead of one property group per client.
+    Manual mappings are editable; bulk mappings are listed read-only.
+    """
+    mode = obs.obs_data_get_string(settings, "mapping_mode") or DEFAULT_MAPPING_MODE
+    manual = mode == "manual"
+
+    obs.obs_property_set_visible(obs.obs_properties_get(props, "mapping_file"), mode == "file")
+    obs.obs_property_set_visible(obs.obs_properties_get(props, "number_of_clients"), manual)
+
+    count = obs.obs_data_get_int(settings, "number_of_clients") if manual else len(sink.clients)
+    pages = max(1, math.ceil(count / CLIENTS_PER_PAGE))
+    page = min(max(1, obs.obs_data_get_int(settings, "client_page")), pages)
+    obs.obs_property_int_set_limits(obs.obs_properties_get(props, "client_page"), 1, pages, 1)
+    obs.obs_property_set_visible(obs.obs_properties_get(props, "client_page"), pages > 1)
+
+    summary = f"{count} clients, page {page} of {pages}"
+    if not manual:
+        summary = f"{len(sink.clients)} mappings loaded, {len(sink.mapping_errors)} rows rejected, page {page} of {pages}"
+    obs.obs_property_set_description(obs.obs_properties_get(props, "mapping_summary"), summary)
+
+    for name in sink.shown_client_properties:
+        obs.obs_properties_remove_by_name(props, name)
+    sink.shown_client_properties.clear()
+
+    for i in range((page - 1) * CLIENTS_PER_PAGE, min(count, page * CLIENTS_PER_PAGE)):
+        if manual:
+            add_client_properties(sink, props, i)
+            sink.shown_client_properties.append(f"client_group_{i}")
+        else:
+            client = sink.clients[i]
+            description = f"{i + 1}. {client['osc_address'] or '/'} -> {client['client_ip']}:{client['client_port']} ({client[sink.receive_field]})"
+            obs.obs_properties_add_text(props, f"client_row_{i}", description, obs.OBS_TEXT_INFO)
+            sink.shown_client_properties.append(f"client_row_{i}")
+
+
+def add_client_properties(sink, props, index): #UI
+    # Create property group
+    client_group = obs.obs_properties_create()
+
+    #Add group's properties
+    client_ip = obs.obs_properties_add_text(client_group, f"client_ip_{index}", f"Client {index+1} IP Address", obs.OBS_TEXT_DEFAULT)
+    obs.obs_property_set_long_description(client_ip, "@name sends to a Destination Group from the OSC Send Settings instead; the port is then ignored.")
+    obs.obs_properties_add_int(client_group, f"client_port_{index}", f"Client {index+1} Port", 1, 65535, 1)
+
+    sink.add_client_properties(client_group, index)
+
+    # Send Text Source Selection
+    send_prop = obs.obs_properties_add_list(
+        client_group,
+        f"text_source_send_{index}",
+        f"Client {index + 1} Text Source (Send)",
+        obs.OBS_COMBO_TYPE_LIST,
+        obs.OBS_COMBO_FORMAT_STRING
+    )
+    populate_list_property(send_prop, TEXT_SOURCE_IDS)
+
+    obs.obs_properties_add_text(client_group, f"osc_address_{index}", f"Client {index + 1} OSC Address", obs.OBS_TEXT_DEFAULT)
+
+    #Add property group to Properties list
+    client_property_group = obs.obs_properties_add_group(props, f"client_group_{index}", f"Client {index+1}", obs.OBS_GROUP_NORMAL, client_group)
+    obs.obs_property_set_visible(client_property_group, True)
+
+
+def source_signal_callback(calldata):
+    """
+    Signal callback for text source updates.
+    message format
+    {"address": "/address/filter/", "arguments": ["Arg0","Argument1"]}
+    or the compact form ["/address/filter/", "Arg0", "Argument1"]
+    """
+
+    signalled_at = time.perf_counter() if metrics.enabled else 0.0
+    try:
+        source = obs.calldata_source(calldata,"source")
+        source_name = obs.obs_source_get_name(source)
+
+        # clients that send when this text source updates
+        target_clients = send_index.get(source_name, [])
+
+        source_settings = obs.obs_source_get_settings(source)
+        text = obs.obs_data_get_string(source_settings, "text")
+        obs.obs_data_release(source_settings)
+
+        if send_skip_unchanged and not send_filter.changed(source_name, text):
+            return
+
+        # parsed again only when the text changed since the last update
+        address, arguments = codec.decode(text, source_name)
+
+        if address and arguments is not None:
+            for target_client in target_clients:
+                send_osc_message(target_client, address, arguments)
+            if signalled_at:
+                metrics.count("signals")
+                metrics.observe("signal_to_queued", time.perf_counter() - signalled_at)
+        else:
+            log.warning(f"Invalid JSON format in '{source_name}': Missing 'address' or 'arguments'", key=f"invalid messages in '{source_name}'")
+    except ValueError as e:
+        log.warning(f"Error decoding JSON: {e}", key="JSON decoding errors")
+    except Exception as e:
+        pass
+        # print(f"Error processing OSC send data: {e}")
+
+
+def send_osc_message(client, address, arguments):
+    """
+    Sends an OSC message to the specified address with the given arguments,
+    unless the client's minimum send interval holds it back for ``tick``.
+    """
+    client_ip = client.get("client_ip")
+    client_port = client.get("client_port")
+    interval = client.get("send_interval_ms")
+    if interval is None:
+        interval = send_interval_ms
+    if interval and not send_filter.allow(client_ip, client_port, address, arguments, interval / 1000):
+        return
+    deliver_osc_message(client_ip, client_port, address, arguments)
+
+
+def deliver_osc_message(client_ip, client_port, address, arguments):
+    """
+    Hands one OSC message to the send worker, or to the bundle batcher when
+    bundling is enabled. Neither touches a socket on the calling thread.
+    """
+    try:
+      if send_batching:
+          batcher.add(client_ip, client_port, address, arguments)
+      else:
+          send_worker.submit(client_ip, client_port, address, arguments)
+      if record_outgoing and recorder.recording:
+          recorder.record_message(SENT, address, arguments, (client_ip, client_port))
+
+    except Exception as e:
+        if metrics.enabled:
+            metrics.count("send_errors")
+        log.error(f"Error sending OSC message to {client_ip}:{client_port}: {e}", key=f"send errors to {client_ip}:{client_port}")
+
+
+def configure_outbound(settings):
+    """Applies the OSC Send Settings; ``tick`` (re)starts the bundle flush timer."""
+    global send_batching, send_batch_window_ms, send_skip_unchanged, send_interval_ms
+
+    remove_flush_timer()
+    send_worker.flush()
+
+    send_batching = obs.obs_data_get_bool(settings, "send_batching")
+    send_batch_window_ms = obs.obs_data_get_int(settings, "send_batch_window_ms")
+    batcher.coalesce = obs.obs_data_get_bool(settings, "send_coalesce")
+    send_skip_unchanged = obs.obs_data_get_bool(settings, "send_skip_unchanged")
+    send_interval_ms = obs.obs_data_get_int(settings, "send_interval_ms")
+    send_worker.configure(
+        obs.obs_data_get_int(settings, "send_queue_size"),
+        obs.obs_data_get_int(settings, "send_backlog"),
+        obs.obs_data_get_string(settings, "send_overflow_policy") or DEFAULT_SEND_OVERFLOW_POLICY,
+        obs.obs_data_get_int(settings, "send_retries"),
+    )
+    senders.configure_groups(get_group_specs(settings))
+
+
+def get_group_specs(settings):
+    """Returns every valid Destination Groups line of the OSC Send Settings."""
+    specs = []
+    send_groups = obs.obs_data_get_array(settings, "send_groups")
+    for i in range(obs.obs_data_array_count(send_groups)):
+        item = obs.obs_data_array_item(send_groups, i)
+        text = obs.obs_data_get_string(item, "value")
+        obs.obs_data_release(item)
+        try:
+            specs.append(parse_group(text))
+        except ValueError as e:
+            print(f"Ignoring destination group '{text}': {e}")
+    obs.obs_data_array_release(send_groups)
+    return specs
+
+
+def remove_flush_timer():
+    global flush_timer_added
+    obs.timer_remove(flush_outbound)
+    flush_timer_added = False
+
+
+def flush_outbound():
+    """Has the send worker send the queued outgoing messages as OSC bundles."""
+    send_worker.flush()
+
+
+def configure_receive(settings):
+    """Applies the receive queue settings from the OSC Server Settings group."""
+    global receive_batch_size, no_coalesce_router
+
+    receive_batch_size = obs.obs_data_get_int(settings, "receive_batch_size")
+    no_coalesce = []
+    for address in obs.obs_data_get_string(settings, "receive_no_coalesce").split(","):
+        address = address.strip()
+        if not address:
+            continue
+        try:
+            check_pattern(address)
+        except ValueError as e:
+            # e.g. "/cue/{go" while it is still being typed
+            print(f"Ignoring Never Coalesce address '{address}': {e}")
+            continue
+        no_coalesce.append({"osc_address": address})
+    no_coalesce_router = RoutingTable(no_coalesce)
+
+    policy = obs.obs_data_get_string(settings, "receive_overflow_policy") or DEFAULT_RECEIVE_OVERFLOW_POLICY
+    coalesce = obs.obs_data_get_bool(settings, "receive_coalesce")
+    codec.configure(obs.obs_data_get_string(settings, "payload_format") or DEFAULT_PAYLOAD_FORMAT)
+    receive_queue.configure(obs.obs_data_get_int(settings, "receive_queue_size"), policy, coalesce)
+    # held keyed messages already replace each other, so "coalesce" drops the oldest beyond the limit
+    visibility.configure(obs.obs_data_get_string(settings, "receive_visibility") or DEFAULT_RECEIVE_VISIBILITY,
+                         receive_queue.maxsize, "drop_newest" if policy == "drop_newest" else "drop_oldest")
+
+
+def configure_metrics(settings):
+    """Applies the Metrics and logging settings and starts or stops the HTTP stats endpoint."""
+    global stats_http_port, stats_osc
+
+    metrics.enabled = obs.obs_data_get_bool(settings, "metrics_enabled")
+    log.configure(obs.obs_data_get_string(settings, "log_level") or DEFAULT_LOG_LEVEL, obs.obs_data_get_int(settings, "log_interval"))
+    stats_osc = obs.obs_data_get_bool(settings, "stats_osc")
+
+    port = obs.obs_data_get_int(settings, "stats_http_port")
+    if port != stats_http_port or (port and stats_server.server_address is None):
+        stats_server.stop()
+        stats_http_port = port
+        if port:
+            try:
+                stats_server.start("127.0.0.1", port)
+            except OSError as e:
+                print(f"Stats endpoint could not start on port {port}: {e}")
+
+
+def refresh_metrics_callback(sink, props, property):  # UI
+    obs.obs_property_set_description(obs.obs_properties_get(props, "metrics_summary"), metrics.summary())
+    return True
+
+
+def reset_metrics_callback(sink, props, property):  # UI
+    metrics.reset()
+    return refresh_metrics_callback(sink, props, property)
+
+
+def configure_recording(settings):
+    """Applies the Record and Replay settings that take effect while recording."""
+    global record_outgoing
+    record_outgoing = obs.obs_data_get_bool(settings, "record_outgoing")
+
+
+def start_recording_callback(sink, props, property):  # UI
+    path = obs.obs_data_get_string(sink.settings, "record_file")
+    if not path:
+        print("Choose a recording file first.")
+        return
+    try:
+        recorder.start(path)
+        print(f"Recording OSC to {path}")
+    except OSError as e:
+        print(f"Could not start recording: {e}")
+
+
+def stop_recording_callback(sink, props, property):  # UI
+    if recorder.recording:
+        recorder.stop()
+        print(f"Recorded {recorder.counters['records']} OSC packets to {recorder.path}")
+
+
+def start_replay_callback(sink, props, property):  # UI
+    path = obs.obs_data_get_string(sink.settings, "record_file")
+    if osc_dispatcher is None:
+        print("Start the OSC server before replaying.")
+        return
+    try:
+        replayer.start(path, osc_dispatcher, obs.obs_data_get_double(sink.settings, "replay_speed"))
+        print(f"Replaying OSC from {path}")
+    except (OSError, ValueError) as e:
+        print(f"Could not replay '{path}': {e}")
+
+
+def stop_replay_callback(sink, props, property):  # UI
+    replayer.stop()
+
+
+def drain_receive_queue():
+    """
+    Applies queued OSC messages to their sinks, and the messages held for
+    sources that became visible. Runs on the OBS side.
+    """
+    released = visibility.release()
+    messages = receive_queue.drain(receive_batch_size)
+    current = sinks
+    for sink, target, address, args, received_at in released + messages:
+        if sink not in current:
+            continue  # queued before its script was unloaded
+        if visibility.mode != "always":
+            source_name = sink.source_name(target)
+            if not visibility.visible(source_name):
+                # like the receive queue, trigger addresses are held without a key so none is replaced
+                key = None if no_coalesce_router.match(args[0]) else (sink.name, sink.target_key(target), args[0])
+                visibility.hold(source_name, key, (sink, target, address, args, 0.0))
+                continue
+        sink.apply(target, address, args)
+        if received_at:
+            metrics.observe("receive_to_applied", time.perf_counter() - received_at)
+    if messages:
+        receive_queue.mark_applied(len(messages))
+    if messages or released:
+        for sink in current:
+            sink.flush()
+
+
+def tick(sink, seconds):
+    """
+    Per frame work, run from ``script_tick`` of the first loaded sink only so
+    two loaded scripts do not drain the queue twice per frame.
+    """
+    global flush_timer_added, needs_reconnect
+
+    if not sinks or sink is not sinks[0]:
+        return
+
+    # timers and signal connections belong to the script that adds them in OBS
+    if needs_reconnect:
+        source_cache.connect()
+        connect_send_sources()
+        needs_reconnect = False
+    if send_batching and send_batch_window_ms > 0 and not flush_timer_added:
+        obs.timer_add(flush_outbound, send_batch_window_ms)
+        flush_timer_added = True
+
+    drain_receive_queue()
+
+    # messages held back by the minimum send interval
+    for client_ip, client_port, address, arguments in send_filter.due():
+        deliver_osc_message(client_ip, client_port, address, arguments)
+
+    # Without a bundle window, queued messages are flushed once per video frame
+    if send_batching and send_batch_window_ms <= 0:
+        send_worker.flush()
+
+    # an active recording can be read up to the last frame
+    if recorder.recording:
+        recorder.flush()
+
+
+def start_server_callback(sink, props, property):
+    if not server_running:
+        start_osc_server(sink)
+        print("OSC Server Started via button." if server_running else "OSC Server could not start.")
+    obs.obs_property_set_description(obs.obs_properties_get(props, "server_status"), server_status())
+    return True
+
+
+def stop_server_callback(sink, props, property):
+    if server_running:
+        stop_osc_server()
+        print("OSC Server Stopped via button.")
+    obs.obs_property_set_description(obs.obs_properties_get(props, "server_status"), server_status())
+    return True
+
+
+def server_status():
+    """Describes the OSC server state for the properties UI."""
+    if server_running:
+        addresses = ", ".join(f"{address[0]}:{address[1]}" for address in listeners.server_addresses)
+        status = f"Server running on {addresses} ({listeners.engine})"
+    else:
+        status = "Server stopped"
+    if listeners.errors:
+        status += "; could not listen on " + "; ".join(f"{name}: {error}" for name, error in listeners.errors.items())
+    return status
+
+
+def select_message(osc_address):
+    """
+    Ingest callback, run with only the OSC address of a received message read.
+    Returns every client whose OSC address filter matches, or ``None`` when no
+    sink would apply the message, so its arguments are never decoded.
+    """
+    matched = router.match(osc_address)
+    if matched or any(sink.receives_unmatched for sink in sinks):
+        return matched
+    if metrics.enabled:
+        metrics.count("unrouted")
+    return None
+
+
+def route_message(address, *args):
+    """
+    OSC server callback for a fully decoded message. Runs on the server thread,
+    so it only routes the message and queues it; ``tick`` applies it.
+    """
+    deliver_message(address, args, router.match(args[0]))
+
+
+def deliver_message(address, args, matched):
+    """
+    Queues a received message for every sink it goes to, given the clients
+    ``matched`` by its OSC address (``args[0]``).
+    """
+    received_at = time.perf_counter() if metrics.enabled else 0.0
+    osc_address = args[0]
+    # Trigger addresses are queued without a key so they are never coalesced
+    coalesce = not no_coalesce_router.match(osc_address)
+
+    # Every client whose OSC address filter matches receives the message
+    current = sinks
+    for sink in current:
+        clients = matched if len(current) == 1 else [client for client in matched if client["sink"] == sink.name]
+        if matched and not clients:
+            continue  # routed to another sink's clients; not unmatched here
+        for target in sink.targets(clients):
+            key = (sink.name, sink.target_key(target), osc_address) if coalesce else None
+            receive_queue.put(key, (sink, target, address, args, received_at))
+
+    if received_at:
+        if not matched:
+            metrics.count("unrouted")
+        metrics.count("received")
+        metrics.observe("receive_to_queued", time.perf_counter() - received_at)
+
+
+def get_listener_specs(settings):
+    """
+    Returns the listeners to bind: the Server IP/Port from the OSC Server
+    Settings plus every valid Additional Listeners line.
+    """
+    server_ip = obs.obs_data_get_string(settings, "server_ip") or DEFAULT_SERVER_IP
+    server_port = obs.obs_data_get_int(settings, "server_port")
+    allow = [ip.strip() for ip in obs.obs_data_get_string(settings, "server_allow_list").split(",") if ip.strip()]
+    specs = [{
+        "ip": server_ip,
+        "port": server_port,
+        "rcvbuf_kb": obs.obs_data_get_int(settings, "receive_buffer_kb"),
+        "allow": allow,
+    }]
+
+    extra_listeners = obs.obs_data_get_array(settings, "extra_listeners")
+    for i in range(obs.obs_data_array_count(extra_listeners)):
+        item = obs.obs_data_array_item(extra_listeners, i)
+        text = obs.obs_data_get_string(item, "value")
+        obs.obs_data_release(item)
+        try:
+            specs.append(parse_listener(text))
+        except ValueError as e:
+            print(f"Ignoring listener '{text}': {e}")
+    obs.obs_data_array_release(extra_listeners)
+    return specs
+
+
+def reply_stats(client_address, address, *args):
+    """
+    Answers ``/osc_io/stats [reply_port]`` with the metrics snapshot as a JSON
+    string. Handled like any other message when Answer /osc_io/stats Requests is off.
+    """
+    if not stats_osc:
+        route_message(client_address, address, *args)
+        return
+    reply_port = args[0] if args and isinstance(args[0], int) else client_address[1]
+    try:
+        # a one-off socket: pooling a sender per requester would keep one open per polling socket
+        family = socket.AF_INET6 if ":" in client_address[0] else socket.AF_INET
+        with socket.socket(family, socket.SOCK_DGRAM) as reply_socket:
+            reply_socket.sendto(build_message("/osc_io/stats", json.dumps(metrics.snapshot())).dgram, (client_address[0], reply_port))
+    except Exception as e:
+        log.error(f"Error sending OSC stats: {e}", key="stats reply errors")
+
+
+def start_osc_server(sink):
+    """
+    Starts the shared OSC server with the settings of ``sink``. When it is
+    already running, only tells ``sink`` so it can start its own transports.
+    The server only counts as running when at least one listener is bound, so
+    after a failed start the Start Server button tries again.
+    """
+    global server_running, osc_dispatcher, ingest
+    if server_running:
+        sink.server_started()
+        return
+    try:
+        # only the address of a message is read until select_message wants it
+        ingest = OscIngest(select_message, deliver_message)
+        ingest.map("/osc_io/stats", reply_stats)
+
+        engine = obs.obs_data_get_string(sink.settings, "server_engine") or DEFAULT_SERVER_ENGINE
+        reuse_address = obs.obs_data_get_bool(sink.settings, "server_reuse_address")
+        listeners.start(engine, get_listener_specs(sink.settings), RecordingDispatcher(ingest, recorder), reuse_address)
+        osc_dispatcher = ingest  # replays skip the recorder
+    except Exception as e:
+        print(f"server could not start: {e}")
+    server_running = len(listeners) > 0
+    for loaded in sinks:
+        loaded.server_started()
+
+
+def stop_osc_server():
+    global server_running, osc_dispatcher
+    replayer.stop()
+    osc_dispatcher = None
+    for name, counters in listeners.stats().items():
+        print(f"OSC listener {name} {counters}")
+    if ingest is not None:
+        print(f"OSC ingest {ingest.counters}")
+    listeners.shutdown()
+    for sink in sinks:
+        sink.server_stopped()
+    server_running = False
+
+
+def unload(sink):
+    """
+    Unregisters ``sink``. The server and everything else keep running for the
+    other loaded scripts; the last one to unload shuts them down.
+    """
+    global sinks, needs_reconnect, stats_http_port
+
+    if sink not in sinks:
+        return
+    sinks = tuple(loaded for loaded in sinks if loaded is not sink)
+    sink.server_stopped()
+    sink.clients = []
+    rebuild_routes()
+
+    # OBS drops the signal connections and timers of an unloaded script; the
+    # next tick of a remaining script makes them again
+    for source_name in list(send_sources):
+        disconnect_send_source(source_name)
+    visibility.clear()
+    source_cache.disconnect()
+    remove_flush_timer()
+    if sinks:
+        needs_reconnect = True
+        return
+
+    replayer.stop()
+    recorder.stop()
+
+    print("Stopping OSC server...")
+    stop_osc_server()
+    print("OSC server stopped.")
+
+    print(f"OSC receive queue {receive_queue.counters}")
+    log.stop()
+    if metrics.enabled:
+        print(f"OSC metrics\n{metrics.summary()}")
+    stats_server.stop()
+    stats_http_port = DEFAULT_STATS_HTTP_PORT
+    receive_queue.clear()
+
+    print(f"OSC send filter {send_filter.counters}")
+    send_filter.clear()
+    send_worker.stop()
+    print(f"OSC send worker {send_worker.counters}")
+    for (client_ip, client_port), counters in senders.stats().items():
+        print(f"OSC sender {client_ip}:{client_port} sent {counters['sent']}, errors {counters['errors']}")
+    senders.close()
@@ -0,0 +1,158 @@
+"""
+OSC IO: Ingest
+==============
+
+Lazy parsing of received datagrams. ``OscIngest`` stands in for python-osc's
+dispatcher on the OSC server: it reads only the address pattern of each
+message and asks ``select`` whether the message goes anywhere before decoding
+its type tags and arguments. On a network that mostly carries OSC for other
+devices, most packets cost one address read instead of a full parse.
+
+Bundles are walked element by element in place, by offset into the received
+datagram, without copying elements out of it. Nested bundles are handled the
+same way. Bundle timetags are not waited for; every message is routed as it
+arrives and applied with the next frame, like messages outside bundles.
+
+Integers, floats, doubles, 64-bit integers, strings, blobs and ``T``/``F``/``N``
+are decoded here with ``struct``. Messages with other type tags (arrays, MIDI,
+RGBA, timetags) are decoded by python-osc, which is only imported for them.
+"""
+
+import struct
+
+BUNDLE_PREFIX = b"#bundle\x00"
+FIXED_TYPES = {"i": ">i", "f": ">f", "d": ">d", "h": ">q"}  # type tag -> struct format
+NO_DATA_TYPES = {"T": True, "F": False, "N": None}
+SIMPLE_TYPES = frozenset(FIXED_TYPES) | frozenset(NO_DATA_TYPES) | {"s", "b"}
+MAX_PLANS = 1024  # cached type tag strings; senders choose them, so the cache is bounded
+
+_INT32 = struct.Struct(">i")
+
+
+class OscIngest:
+    """
+    Dispatcher for the OSC server. For each message, ``select(address)``
+    returns what the message is routed to, or ``None`` to skip it without
+    decoding the arguments. Selected messages are passed on as
+    ``deliver(client_address, (address, *arguments), selected)``. Handlers
+    added with ``map`` take exact addresses ahead of ``select`` and are called
+    as ``handler(client_address, address, *arguments)``, like python-osc
+    handlers mapped with ``needs_reply_address``.
+
+    Counts ``messages`` delivered, ``skipped`` messages and malformed
+    ``errors``.
+    """
+
+    def __init__(self, select, deliver):
+        self.select = select
+        self.deliver = deliver
+        self.handlers = {}  # OSC address -> handler
+        self.counters = {"messages": 0, "skipped": 0, "errors": 0}
+        self._plans = {}  # type tag string -> struct for all fixed size arguments, or None
+
+    def map(self, address, handler):
+        """Sends messages for ``address`` to ``handler`` instead of ``deliver``."""
+        self.handlers[address] = handler
+
+    def call_handlers_for_packet(self, data, client_address):
+        try:
+            if data[:8] == BUNDLE_PREFIX:
+                self._bundle(data, 0, len(data), client_address)
+            else:
+                self._message(data, 0, len(data), client_address)
+        except (ValueError, IndexError, struct.error):
+            # ignored like python-osc ignores packets it cannot parse
+            self.counters["errors"] += 1
+        return []
+
+    def _bundle(self, data, start, end, client_address):
+        # "#bundle\0" and an 8 byte timetag, then elements of int32 size + content
+        index = start + 16
+        if index > end:
+            raise ValueError("bundle too short")
+        while index < end:
+            size = _INT32.unpack_from(data, index)[0]
+            index += 4
+            if size <= 0 or index + size > end:
+                raise ValueError("bundle element size out of range")
+            if data[index:index + 8] == BUNDLE_PREFIX:
+                self._bundle(data, index, index + size, client_address)
+            else:
+                self._message(data, index, index + size, client_address)
+            index += size
+
+    def _message(self, data, start, end, client_address):
+        address, index = read_string(data, start, end)
+        if not address.startswith("/"):
+            raise ValueError("OSC address must start with '/'")
+        handler = self.handlers.get(address)
+        if handler is None:
+            selected = self.select(address)
+            if selected is None:
+                self.counters["skipped"] += 1
+                return
+        arguments = self._arguments(data, start, index, end)
+        if handler is not None:
+            handler(client_address, address, *arguments)
+        else:
+            self.counters["messages"] += 1
+            self.deliver(client_address, (address, *arguments), selected)
+
+    def _arguments(self, data, start, index, end):
+        if index >= end:
+            return []
+        type_tags, index = read_string(data, index, end)
+        if not type_tags.startswith(","):
+            raise ValueError("type tag string must start with ','")
+        type_tags = type_tags[1:]
+
+        plan = self._plans.get(type_tags, False)
+        if plan is False:
+            plan = fixed_size_struct(type_tags)
+            if len(self._plans) < MAX_PLANS:
+                self._plans[type_tags] = plan
+        if plan is not None:
+            if index + plan.size > end:
+                raise ValueError("arguments run past the end of the message")
+            return list(plan.unpack_from(data, index))
+
+        if not SIMPLE_TYPES.issuperset(type_tags):
+            from pythonosc import osc_message
+
+            return osc_message.OscMessage(bytes(data[start:end])).params
+
+        arguments = []
+        for tag in type_tags:
+            if tag in FIXED_TYPES:
+                value = struct.unpack_from(FIXED_TYPES[tag], data, index)[0]
+                index += struct.calcsize(FIXED_TYPES[tag])
+            elif tag == "s":
+                value, index = read_string(data, index, end)
+            elif tag == "b":
+                size = _INT32.unpack_from(data, index)[0]
+                index += 4
+                if size < 0 or index + size > end:
+                    raise ValueError("blob size out of range")
+                value = bytes(data[index:index + size])
+                index += size + (-size % 4)
+            else:
+                value = NO_DATA_TYPES[tag]
+            if index > end:
+                raise ValueError("arguments run past the end of the message")
+            arguments.append(value)
+        return arguments
+
+
+def read_string(data, start, end):
+    """Reads a NUL terminated, 4-byte padded OSC string. Returns it and the index after it."""
+    nul = data.find(b"\x00", start, end)
+    if nul < 0:
+        raise ValueError("unterminated string")
+    return bytes(data[start:nul]).decode("utf-8"), nul + 4 - (nul - start) % 4
+
+
+def fixed_size_struct(type_tags):
+    """Returns one ``struct.Struct`` for type tags that are all fixed size numbers, else ``None``."""
+    if type_tags and all(tag in FIXED_TYPES for tag in type_tags):
+        return struct.Struct(">" + "".join(FIXED_TYPES[tag][1] for tag in type_tags))
+    return None
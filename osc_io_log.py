@@ -0,0 +1,122 @@
+"""
+OSC IO: Logging
+===============
+
+Leveled, rate-limited logging for the packet paths. Calls only check the level
+and append to an in-memory buffer; a background thread writes the buffer to the
+OBS script log, so a slow log never holds up the OSC server thread or an OBS
+tick.
+
+Messages logged with a ``key`` are rate limited per key: the first one in each
+interval is written as is and the rest are counted and summarised when the
+interval ends, e.g. ``1,204 messages to /fader/* in last 1s``.
+"""
+
+import collections
+import threading
+import time
+
+LEVELS = {"error": 40, "warning": 30, "info": 20, "debug": 10}
+LOG_LEVELS = [
+    ("Errors", "error"),
+    ("Warnings", "warning"),
+    ("Info", "info"),
+    ("Debug (every message)", "debug"),
+]
+
+
+class RateLimitedLog:
+    """
+    Non-blocking log with ``error``, ``warning``, ``info`` and ``debug``
+    methods. Lines that do not fit in the buffer are dropped and counted.
+    """
+
+    def __init__(self, level="info", interval=1.0, maxsize=1000, write=print):
+        self.threshold = LEVELS[level]
+        self.interval = interval
+        self.maxsize = maxsize
+        self.write = write
+        self.counters = {"written": 0, "suppressed": 0, "dropped": 0}
+        self._lines = collections.deque()
+        self._windows = {}  # key -> [interval start, messages suppressed]
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def configure(self, level, interval=None):
+        if level not in LEVELS:
+            raise ValueError(f"Unknown log level '{level}'")
+        self.threshold = LEVELS[level]
+        if interval:
+            self.interval = interval
+
+    def error(self, message, key=None):
+        self.log(40, message, key)
+
+    def warning(self, message, key=None):
+        self.log(30, message, key)
+
+    def info(self, message, key=None):
+        self.log(20, message, key)
+
+    def debug(self, message, key=None):
+        self.log(10, message, key)
+
+    def log(self, level, message, key=None):
+        if level < self.threshold:
+            return
+        with self._lock:
+            if key is not None:
+                now = time.monotonic()
+                window = self._windows.get(key)
+                if window is not None and now - window[0] < self.interval:
+                    window[1] += 1
+                    self.counters["suppressed"] += 1
+                    return
+                if window is not None and window[1]:
+                    self._append(self._summary(key, window))
+                self._windows[key] = [now, 0]
+            self._append(message)
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="OSC IO log", daemon=True)
+                self._thread.start()
+
+    def _append(self, line):
+        if len(self._lines) >= self.maxsize:
+            self.counters["dropped"] += 1
+        else:
+            self._lines.append(line)
+
+    def _summary(self, key, window):
+        return f"{window[1] + 1:,} {key} in last {self.interval:g}s"
+
+    def _run(self):
+        while not self._stop.wait(0.1):
+            self.flush()
+        self.flush(final=True)
+
+    def flush(self, final=False):
+        """Writes buffered lines and the summaries of finished intervals."""
+        now = time.monotonic()
+        with self._lock:
+            for key, window in list(self._windows.items()):
+                if final or now - window[0] >= self.interval:
+                    if window[1]:
+                        self._append(self._summary(key, window))
+                    del self._windows[key]
+            lines = list(self._lines)
+            self._lines.clear()
+        for line in lines:
+            self.write(line)
+        self.counters["written"] += len(lines)
+
+    def stop(self):
+        """Stops the writer thread after writing everything still buffered."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._stop.set()
+            thread.join()
+        else:
+            self.flush(final=True)
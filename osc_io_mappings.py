@@ -0,0 +1,123 @@
+"""
+OSC IO: Bulk Client Mappings
+============================
+
+Loads client mappings in bulk from a JSON or CSV routing table, either from a
+file on disk or from the text of an OBS Text Source. Each row becomes the same
+client dictionary the scripts build from their per-client properties.
+
+JSON tables are a list of objects (or an object with a ``clients`` list)::
+
+    [{"client_ip": "10.0.0.5", "client_port": 9000, "osc_address": "/fader"}]
+
+CSV tables have a header row naming the same columns::
+
+    client_ip,client_port,osc_address
+    10.0.0.5,9000,/fader
+
+A ``client_ip`` of ``@name`` sends to the destination group ``name`` set up in
+the OSC Send Settings; ``client_port`` can be left empty for those rows.
+"""
+
+import csv
+import io
+import json
+import os
+import sys
+
+from osc_io_routing import check_pattern
+from osc_io_senders import GROUP_PREFIX
+
+REQUIRED_FIELDS = ("client_ip", "client_port")
+
+
+def parse_mappings(text, fields, format=None):
+    """
+    Parses a routing table and returns ``(clients, errors)``.
+
+    ``fields`` maps each script specific column to its default value, e.g.
+    ``{"text_source_receive_name": ""}``. ``format`` is ``"json"`` or ``"csv"``;
+    when omitted it is guessed from the first character of the text.
+    Invalid rows are skipped and described in ``errors``.
+    """
+    text = text.strip()
+    if not text:
+        return [], []
+    if format is None:
+        format = "json" if text[0] in "[{" else "csv"
+
+    if format == "json":
+        try:
+            rows = json.loads(text)
+        except json.JSONDecodeError as e:
+            return [], [f"Invalid JSON mapping table: {e}"]
+        if isinstance(rows, dict):
+            rows = rows.get("clients", [])
+        if not isinstance(rows, list):
+            return [], ["JSON mapping table must be a list of client objects"]
+    elif format == "csv":
+        rows = csv.DictReader(io.StringIO(text))
+    else:
+        raise ValueError(f"Unknown mapping table format '{format}'")
+
+    clients = []
+    errors = []
+    for row_number, row in enumerate(rows, start=1):
+        client, error = _validate_row(row, fields)
+        if error:
+            errors.append(f"Row {row_number}: {error}")
+        else:
+            clients.append(client)
+    return clients, errors
+
+
+def load_mappings_file(path, fields):
+    """Reads a ``.json`` or ``.csv`` routing table from disk. Returns ``(clients, errors)``."""
+    extension = os.path.splitext(path)[1].lower()
+    format = {".json": "json", ".csv": "csv"}.get(extension)
+    try:
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            text = f.read()
+    except OSError as e:
+        return [], [f"Could not read mapping file '{path}': {e}"]
+    return parse_mappings(text, fields, format)
+
+
+def _validate_row(row, fields):
+    if not isinstance(row, dict):
+        return None, "expected an object"
+
+    # a destination group ("@name") has its own ports, so client_port is optional
+    group = str(row.get("client_ip") or "").strip().startswith(GROUP_PREFIX)
+    missing = [name for name in REQUIRED_FIELDS if row.get(name) in (None, "") and not (group and name == "client_port")]
+    if missing:
+        return None, f"missing {', '.join(missing)}"
+
+    if group and row.get("client_port") in (None, ""):
+        client_port = 0
+    else:
+        try:
+            client_port = int(row["client_port"])
+        except (TypeError, ValueError):
+            return None, f"client_port '{row['client_port']}' is not a number"
+        if not 1 <= client_port <= 65535:
+            return None, f"client_port {client_port} is out of range"
+
+    osc_address = str(row.get("osc_address") or "")
+    if osc_address and not osc_address.startswith("/"):
+        return None, f"osc_address '{osc_address}' must start with '/'"
+    try:
+        check_pattern(osc_address)
+    except ValueError as e:  # any invalid pattern, [z-a] included, rejects only this row
+        return None, str(e)
+
+    # Interning keeps thousands of rows that share IPs and source names compact
+    client = {
+        "client_ip": sys.intern(str(row["client_ip"]).strip()),
+        "client_port": client_port,
+        "osc_address": osc_address,
+    }
+    for name, default in fields.items():
+        value = row.get(name)
+        client[name] = sys.intern(str(value)) if value not in (None, "") else default
+    return client, None
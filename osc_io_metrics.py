@@ -0,0 +1,194 @@
+"""
+OSC IO: Metrics
+===============
+
+Counters and latency histograms for the OSC pipeline:
+
+* receive: message received on the server thread -> routed and queued -> applied
+  to its source on the OBS side,
+* send: source ``update`` signal -> message queued for the send worker (or
+  for a bundle) -> sent by the worker.
+
+Metrics are off by default. Call sites check ``metrics.enabled`` before reading
+the clock, so a disabled ``Metrics`` costs one attribute lookup per message.
+
+``StatsServer`` optionally serves ``Metrics.snapshot()`` as JSON over HTTP on a
+local port, e.g. ``curl http://127.0.0.1:9100/stats``. ``http.server`` is only
+imported when it starts.
+"""
+
+import bisect
+import json
+import select
+import socket
+import threading
+import time
+
+LATENCY_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram; percentiles are reported as bucket upper bounds."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BOUNDS_MS) + 1)  # last bucket is everything slower
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, seconds):
+        ms = seconds * 1000.0
+        self.buckets[bisect.bisect_left(LATENCY_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, fraction):
+        """Returns the upper bound (ms) of the bucket holding ``fraction`` of the samples."""
+        if not self.count:
+            return 0.0
+        max_ms = round(self.max_ms, 3)
+        rank = fraction * self.count
+        seen = 0
+        for bound, n in zip(LATENCY_BOUNDS_MS, self.buckets):
+            seen += n
+            if seen >= rank:
+                return min(bound, max_ms)
+        return max_ms
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class Metrics:
+    """
+    Named counters and latency histograms, plus ``providers``: callables that
+    return the counters other components already keep (queue, listeners,
+    senders), so ``snapshot`` reports everything in one place.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.providers = {}  # name -> callable returning JSON serialisable data
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears every counter and histogram."""
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+            self.started = time.time()
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def observe(self, name, seconds):
+        """Adds one latency sample, in seconds (e.g. a ``time.perf_counter()`` difference)."""
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def snapshot(self):
+        """Returns counters, latency percentiles and provider data as a dictionary."""
+        with self._lock:
+            stats = {
+                "enabled": self.enabled,
+                "uptime_s": round(time.time() - self.started, 1),
+                "counters": dict(self.counters),
+                "latency": {name: histogram.snapshot() for name, histogram in self.histograms.items()},
+            }
+        for name, provider in self.providers.items():
+            try:
+                stats[name] = provider()
+            except Exception as e:
+                stats[name] = f"unavailable: {e}"
+        return stats
+
+    def summary(self):
+        """Returns a short multi-line text version of ``snapshot`` for the script UI."""
+        if not self.enabled:
+            return "Metrics are disabled."
+        stats = self.snapshot()
+        lines = [f"{name}: {value}" for name, value in sorted(stats["counters"].items())]
+        for name, latency in sorted(stats["latency"].items()):
+            lines.append(f"{name}: p50 {latency['p50_ms']} ms, p99 {latency['p99_ms']} ms, max {latency['max_ms']} ms ({latency['count']})")
+        return "\n".join(lines) or "No messages yet."
+
+
+class StatsServer:
+    """
+    Read-only HTTP endpoint serving a ``Metrics`` snapshot as JSON on
+    ``GET /stats``. Its thread also waits on a wake-up socket, so ``stop``
+    returns at once instead of after socketserver's poll interval.
+    """
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+        self._server = None
+        self._thread = None
+        self._wake_reader = None
+        self._wake_writer = None
+        self._stop = False
+
+    def start(self, ip, port):
+        """Starts serving on ``ip:port``. Raises ``OSError`` if the port is taken."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        self.stop()
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/stats"):
+                    self.send_error(404)
+                    return
+                body = json.dumps(metrics.snapshot()).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # keep requests out of the OBS script log
+
+        self._server = ThreadingHTTPServer((ip, port), Handler)
+        self._server.daemon_threads = True
+        self._server.timeout = 0  # handle_request only handles what select found ready
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._stop = False
+        self._thread = threading.Thread(target=self._serve, name="OSC IO stats", daemon=True)
+        self._thread.start()
+        print(f"Serving OSC IO stats on http://{ip}:{self._server.server_address[1]}/stats")
+
+    def stop(self):
+        if self._server is not None:
+            self._stop = True
+            self._wake_writer.send(b"\0")
+            self._thread.join()
+            self._server.server_close()
+            self._wake_reader.close()
+            self._wake_writer.close()
+            self._server = None
+            self._thread = None
+
+    def _serve(self):
+        while not self._stop:
+            ready, _, _ = select.select([self._server.socket, self._wake_reader], [], [])
+            if self._server.socket in ready:
+                self._server.handle_request()
+
+    @property
+    def server_address(self):
+        return self._server.server_address if self._server is not None else None
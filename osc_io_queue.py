@@ -0,0 +1,99 @@
+"""
+OSC IO: Receive Queue
+=====================
+
+Bounded hand-off between the OSC server thread and OBS. The server thread only
+puts received messages into the queue; the script drains it in batches from
+``script_tick`` so all OBS API calls happen on the OBS side.
+
+Each message is queued with a key, normally ``(target source, OSC address)``.
+With ``coalesce`` enabled a new message replaces the queued one with the same
+key, so a source is updated at most once per frame with the latest value.
+Messages queued with a ``None`` key are never replaced.
+
+When the queue is full the overflow policy decides what is lost:
+
+* ``drop_oldest`` discards the oldest queued message,
+* ``drop_newest`` discards the message being added,
+* ``coalesce`` always coalesces by key and discards the oldest message
+  when a new key does not fit.
+"""
+
+import itertools
+import threading
+from collections import OrderedDict
+
+OVERFLOW_POLICIES = ["drop_oldest", "drop_newest", "coalesce"]
+
+
+class ReceiveQueue:
+    """
+    Bounded FIFO of received messages with ``enqueued``, ``dropped``,
+    ``coalesced`` and ``applied`` counters.
+    """
+
+    def __init__(self, maxsize=1024, policy="drop_oldest", coalesce=False):
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self.maxsize = maxsize
+        self.policy = policy
+        self.coalesce = coalesce
+        self.counters = {"enqueued": 0, "dropped": 0, "coalesced": 0, "applied": 0}
+
+    def configure(self, maxsize, policy, coalesce=False):
+        """Changes the size limit, overflow policy and coalescing, trimming the oldest items if needed."""
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'")
+        with self._lock:
+            self.maxsize = max(1, maxsize)
+            self.policy = policy
+            self.coalesce = coalesce
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.counters["dropped"] += 1
+
+    def put(self, key, item):
+        """
+        Adds ``item``, replacing a queued item with the same ``key`` when
+        coalescing. Returns False if the item was dropped.
+        """
+        with self._lock:
+            self.counters["enqueued"] += 1
+            if key is None or not (self.coalesce or self.policy == "coalesce"):
+                key = next(self._sequence)
+            elif key in self._items:
+                # keep the queue position, take the newest arguments
+                self._items[key] = item
+                self.counters["coalesced"] += 1
+                return True
+
+            if len(self._items) >= self.maxsize:
+                self.counters["dropped"] += 1
+                if self.policy == "drop_newest":
+                    return False
+                self._items.popitem(last=False)
+            self._items[key] = item
+            return True
+
+    def drain(self, limit=0):
+        """Removes and returns up to ``limit`` items (all of them when ``limit`` is 0)."""
+        with self._lock:
+            if not limit or limit >= len(self._items):
+                items = list(self._items.values())
+                self._items.clear()
+            else:
+                items = [self._items.popitem(last=False)[1] for _ in range(limit)]
+        return items
+
+    def mark_applied(self, count):
+        """Counts messages the script has applied to OBS after draining them."""
+        self.counters["applied"] += count
+
+    def clear(self):
+        """Discards everything queued."""
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
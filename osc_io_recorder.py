@@ -0,0 +1,255 @@
+"""
+OSC IO: Record and Replay
+=========================
+
+Records OSC packets (as raw bytes, with their peer address and a monotonic
+timestamp) to an append-only binary file, and plays recordings back into a
+dispatcher at the original speed, scaled, or as fast as possible.
+
+File layout, all little endian::
+
+    b"OSCREC1\\n"
+    record*: uint64 nanoseconds since the recording started
+             uint8  direction (0 = received, 1 = sent)
+             uint8  length of the peer IP
+             uint16 peer port
+             uint32 length of the packet
+             peer IP (ASCII), packet bytes
+
+Records are never rewritten and the scripts ``flush`` the recorder once per
+frame, so the file can be read with ``mmap`` while it grows, up to the last
+frame; a record still partly written is skipped. A ``.idx`` file next to it holds ``(nanoseconds, offset)`` pairs every
+``INDEX_INTERVAL`` records, which lets ``OscRecording.records`` start at a time
+without reading everything before it; it is rebuilt if missing.
+"""
+
+import bisect
+import mmap
+import os
+import struct
+import threading
+import time
+
+MAGIC = b"OSCREC1\n"
+RECORD_HEADER = struct.Struct("<QBBHI")
+INDEX_ENTRY = struct.Struct("<QQ")
+INDEX_INTERVAL = 1024  # records between index entries
+RECEIVED = 0
+SENT = 1
+
+
+class OscRecorder:
+    """Appends packets to a recording file. Safe to call from several threads."""
+
+    def __init__(self):
+        self._file = None
+        self._index = None
+        self._lock = threading.Lock()
+        self._started = 0
+        self.path = None
+        self.counters = {"records": 0, "bytes": 0}
+
+    @property
+    def recording(self):
+        return self._file is not None
+
+    def start(self, path):
+        """Starts a new recording at ``path``, replacing any existing file."""
+        self.stop()
+        with self._lock:
+            self._file = open(path, "wb")
+            self._file.write(MAGIC)
+            self._file.flush()  # readable as a recording right away
+            self._index = open(path + ".idx", "wb")
+            self._started = time.monotonic_ns()
+            self.path = path
+            self.counters = {"records": 0, "bytes": 0}
+
+    def record(self, direction, data, peer):
+        """Appends one packet. ``peer`` is the ``(ip, port)`` it came from or went to."""
+        with self._lock:
+            if self._file is None:
+                return
+            elapsed = time.monotonic_ns() - self._started
+            if self.counters["records"] % INDEX_INTERVAL == 0:
+                self._index.write(INDEX_ENTRY.pack(elapsed, self._file.tell()))
+            ip = peer[0].encode("ascii")
+            self._file.write(RECORD_HEADER.pack(elapsed, direction, len(ip), peer[1], len(data)) + ip + data)
+            self.counters["records"] += 1
+            self.counters["bytes"] += len(data)
+
+    def record_message(self, direction, address, arguments, peer):
+        """Builds and appends an OSC message, for packets that only exist as address and arguments."""
+        if self._file is None:
+            return
+        from pythonosc import osc_message_builder
+
+        builder = osc_message_builder.OscMessageBuilder(address=address)
+        if arguments is None:
+            arguments = []
+        for value in arguments if isinstance(arguments, (list, tuple)) else [arguments]:
+            builder.add_arg(value)
+        self.record(direction, builder.build().dgram, peer)
+
+    def flush(self):
+        """Writes buffered records and index entries to disk, for readers of a recording in progress."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._index.flush()
+
+    def stop(self):
+        """Finishes the recording and closes its files."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._index.close()
+                self._file = None
+                self._index = None
+
+
+class RecordingDispatcher:
+    """Stands in for a dispatcher and records every received packet before dispatching it."""
+
+    def __init__(self, dispatcher, recorder):
+        self.dispatcher = dispatcher
+        self.recorder = recorder
+
+    def call_handlers_for_packet(self, data, client_address):
+        if self.recorder.recording:
+            self.recorder.record(RECEIVED, data, client_address)
+        return self.dispatcher.call_handlers_for_packet(data, client_address)
+
+
+class OscRecording:
+    """
+    Read access to a recording file through ``mmap``. Iterating yields
+    ``(nanoseconds, direction, (ip, port), packet bytes)``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"'{path}' is not an OSC IO recording")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._index = self._load_index()
+
+    def close(self):
+        self._map.close()
+
+    def _load_index(self):
+        try:
+            with open(self.path + ".idx", "rb") as f:
+                data = f.read()
+            entries = [INDEX_ENTRY.unpack_from(data, i) for i in range(0, len(data) - INDEX_ENTRY.size + 1, INDEX_ENTRY.size)]
+        except OSError:
+            entries = []
+        if not entries:
+            # no index file: build it in memory from the records
+            entries = [(ns, offset) for i, (ns, offset) in enumerate(self._offsets()) if i % INDEX_INTERVAL == 0]
+        return entries
+
+    def _offsets(self, offset=len(MAGIC)):
+        size = len(self._map)
+        while offset + RECORD_HEADER.size <= size:
+            ns, _, ip_length, _, length = RECORD_HEADER.unpack_from(self._map, offset)
+            end = offset + RECORD_HEADER.size + ip_length + length
+            if end > size:
+                return  # record still being written
+            yield ns, offset
+            offset = end
+
+    def records(self, start=0.0):
+        """Yields records from ``start`` seconds into the recording."""
+        start_ns = int(start * 1e9)
+        offset = len(MAGIC)
+        if start_ns and self._index:
+            i = bisect.bisect_right([ns for ns, _ in self._index], start_ns) - 1
+            if i >= 0:
+                offset = self._index[i][1]
+        for ns, offset in self._offsets(offset):
+            if ns < start_ns:
+                continue
+            _, direction, ip_length, port, length = RECORD_HEADER.unpack_from(self._map, offset)
+            body = offset + RECORD_HEADER.size
+            ip = self._map[body:body + ip_length].decode("ascii")
+            yield ns, direction, (ip, port), self._map[body + ip_length:body + ip_length + length]
+
+    def __iter__(self):
+        return self.records()
+
+    def duration(self):
+        """Returns the time of the last record, in seconds."""
+        last = 0
+        start = self._index[-1][1] if self._index else len(MAGIC)
+        for ns, _ in self._offsets(start):
+            last = ns
+        return last / 1e9
+
+
+def replay(recording, dispatcher, speed=1.0, start=0.0, direction=RECEIVED, stop_event=None):
+    """
+    Feeds the recorded packets of ``direction`` into
+    ``dispatcher.call_handlers_for_packet``. ``speed`` scales the original
+    timing (2.0 is twice as fast); 0 replays as fast as possible. Stops early
+    when ``stop_event`` is set. Returns the number of packets replayed.
+    """
+    count = 0
+    first_ns = None
+    began = time.perf_counter()
+    for ns, record_direction, peer, data in recording.records(start):
+        if stop_event is not None and stop_event.is_set():
+            break
+        if record_direction != direction:
+            continue
+        if first_ns is None:
+            first_ns = ns
+        if speed > 0:
+            delay = (ns - first_ns) / 1e9 / speed - (time.perf_counter() - began)
+            if delay > 0:
+                if stop_event is not None:
+                    if stop_event.wait(delay):
+                        break
+                else:
+                    time.sleep(delay)
+        try:
+            dispatcher.call_handlers_for_packet(data, peer)
+        except Exception as e:
+            print(f"Error replaying OSC packet: {e}")
+        count += 1
+    return count
+
+
+class Replayer:
+    """Runs ``replay`` on a background thread so it can be started and stopped from the script UI."""
+
+    def __init__(self):
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, path, dispatcher, speed=1.0):
+        """Starts replaying ``path``. Raises ``OSError`` or ``ValueError`` if it cannot be read."""
+        self.stop()
+        recording = OscRecording(path)
+        self._stop = threading.Event()
+
+        def run():
+            try:
+                count = replay(recording, dispatcher, speed, stop_event=self._stop)
+                print(f"Replayed {count} OSC packets from {os.path.basename(path)}")
+            finally:
+                recording.close()
+
+        self._thread = threading.Thread(target=run, name="OSC IO replay", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
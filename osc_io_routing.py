@@ -0,0 +1,145 @@
+"""
+OSC IO: Address Routing
+=======================
+
+Routing table shared by the OSC IO scripts. Client OSC addresses are stored in
+a trie keyed by address segments, so finding every client that should receive
+an incoming message costs one step per segment of the incoming address instead
+of one comparison per configured client.
+
+A client address acts as a filter: ``/fader`` matches ``/fader`` and
+``/fader/1``, but not ``/faders``. Segments may use the OSC 1.0 wildcards
+``*``, ``?``, ``[a-z]``, ``[!a-z]`` and ``{foo,bar}``.
+"""
+
+import re
+
+_WILDCARD_RE = re.compile(r"[*?\[\]{}]")
+
+
+def split_address(address):
+    """Splits an OSC address into its non-empty segments."""
+    return [segment for segment in address.split("/") if segment]
+
+
+def has_wildcards(segment):
+    """Returns True if an address segment uses OSC pattern syntax."""
+    return _WILDCARD_RE.search(segment) is not None
+
+
+def check_pattern(address):
+    """Raises ``ValueError`` if a wildcard segment of ``address`` is not a valid OSC pattern."""
+    for segment in split_address(address):
+        if has_wildcards(segment):
+            compile_pattern(segment)
+
+
+def compile_pattern(segment):
+    """
+    Compiles a single OSC 1.0 address pattern segment into a regular expression.
+    Wildcards never cross a ``/`` boundary. Raises ``ValueError`` for invalid
+    patterns, such as ``[z-a]`` or an empty ``[]``.
+    """
+    regex = []
+    i = 0
+    while i < len(segment):
+        char = segment[i]
+        if char == "*":
+            regex.append("[^/]*")
+        elif char == "?":
+            regex.append("[^/]")
+        elif char == "[":
+            end = segment.find("]", i + 1)
+            if end == -1:
+                raise ValueError(f"Unterminated '[' in OSC pattern '{segment}'")
+            body = segment[i + 1:end]
+            negate = body.startswith("!")
+            if negate:
+                body = body[1:]
+            body = body.replace("\\", "\\\\").replace("^", "\\^")
+            regex.append(f"[{'^' if negate else ''}{body}]")
+            i = end
+        elif char == "{":
+            end = segment.find("}", i + 1)
+            if end == -1:
+                raise ValueError(f"Unterminated '{{' in OSC pattern '{segment}'")
+            options = segment[i + 1:end].split(",")
+            regex.append("(?:" + "|".join(re.escape(option) for option in options) + ")")
+            i = end
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    try:
+        return re.compile("".join(regex))
+    except re.error as e:
+        raise ValueError(f"Invalid OSC pattern '{segment}': {e}") from None
+
+
+class _Node:
+    __slots__ = ("literal", "wildcard", "entries")
+
+    def __init__(self):
+        self.literal = {}  # segment -> _Node
+        self.wildcard = []  # (compiled pattern, _Node)
+        self.entries = []  # (client index, client)
+
+
+class RoutingTable:
+    """
+    Immutable lookup structure built from a list of client dictionaries.
+    Build a new table and swap the reference to change the routes; a lookup
+    running on the server thread keeps using the table it started with.
+    """
+
+    def __init__(self, clients=(), key="osc_address"):
+        self._root = _Node()
+        self._size = 0
+        for index, client in enumerate(clients):
+            self._insert(index, client, client.get(key) or "")
+
+    def __len__(self):
+        return self._size
+
+    def _insert(self, index, client, address):
+        node = self._root
+        for segment in split_address(address):
+            if has_wildcards(segment):
+                pattern = compile_pattern(segment)
+                child = next((n for p, n in node.wildcard if p.pattern == pattern.pattern), None)
+                if child is None:
+                    child = _Node()
+                    node.wildcard.append((pattern, child))
+            else:
+                child = node.literal.get(segment)
+                if child is None:
+                    child = node.literal[segment] = _Node()
+            node = child
+        node.entries.append((index, client))
+        self._size += 1
+
+    def match(self, address):
+        """
+        Returns every client whose OSC address filter matches ``address``,
+        in the order the clients were configured.
+        """
+        matches = []
+        nodes = [self._root]
+        for segment in split_address(address):
+            next_nodes = []
+            for node in nodes:
+                matches.extend(node.entries)
+                child = node.literal.get(segment)
+                if child is not None:
+                    next_nodes.append(child)
+                for pattern, child in node.wildcard:
+                    if pattern.fullmatch(segment):
+                        next_nodes.append(child)
+            nodes = next_nodes
+            if not nodes:
+                break
+        for node in nodes:
+            matches.extend(node.entries)
+
+        if len(matches) > 1:
+            matches.sort(key=lambda entry: entry[0])
+        return [client for _, client in matches]
@@ -0,0 +1,633 @@
+"""
+OSC IO: Sender Pool
+===================
+
+Keeps one persistent ``SimpleUDPClient`` (and so one UDP socket) per
+``(client_ip, client_port)`` destination instead of constructing a new client
+for every outgoing message. Sockets are opened when the script loads its
+clients and closed together when the script unloads.
+
+A client whose IP is ``@name`` sends to the destination group ``name``
+instead: a multicast group, a broadcast address or a list of unicast
+addresses, served by one ``DestinationGroup`` socket that encodes each message
+once and sends the same datagram to every address.
+
+``OutboundBatcher`` optionally collects messages per destination and sends
+each batch as a single OSC bundle. ``SendFilter`` skips send source updates
+whose text has not changed and can limit how often each client is sent an
+address. ``SendWorker`` does the actual sending on its own thread, so the OBS
+thread that signalled a text source update never waits on a socket, a
+hostname lookup or an unreachable destination.
+
+python-osc is imported when the first sender is opened or bundle built.
+"""
+
+import collections
+import socket
+import threading
+import time
+
+MAX_BUNDLE_SIZE = 8192  # bytes; larger batches are split over several bundles
+SEND_OVERFLOW_POLICIES = ["drop_oldest", "drop_newest"]
+RETRY_DELAY = 0.05  # seconds before the first retry of a failed send, doubled for each further retry
+STOP_TIMEOUT = 1.0  # seconds ``SendWorker.stop`` waits for queued messages to go out
+GROUP_PREFIX = "@"  # client IP prefix naming a destination group
+DEFAULT_MULTICAST_TTL = 1  # multicast stays on the local network
+
+
+def parse_group(text):
+    """
+    Parses a destination group line ``name ip:port[,ip:port...] [ttl=N]
+    [iface=ip]`` into a spec dictionary. IPv6 addresses are written in
+    brackets, e.g. ``[ff02::1]:9000``; their ``iface`` is an interface name
+    or index.
+    """
+    parts = text.split()
+    if len(parts) < 2:
+        raise ValueError("Expected a name and at least one ip:port")
+    spec = {"name": parts[0].lstrip(GROUP_PREFIX), "addresses": [], "ttl": DEFAULT_MULTICAST_TTL, "interface": ""}
+    for destination in parts[1].split(","):
+        host, separator, port = destination.rpartition(":")
+        if not separator or not host or not port.isdigit() or not 1 <= int(port) <= 65535:
+            raise ValueError(f"Destination '{destination}' must be ip:port")
+        spec["addresses"].append((host.strip("[]"), int(port)))
+    for option in parts[2:]:
+        name, _, value = option.partition("=")
+        if name == "ttl" and value.isdigit() and 0 <= int(value) <= 255:
+            spec["ttl"] = int(value)
+        elif name == "iface" and value:
+            spec["interface"] = value
+        else:
+            raise ValueError(f"Unknown destination group option '{option}'")
+    return spec
+
+
+def build_message(address, arguments):
+    """Builds an ``OscMessage`` from one argument or a list of them, like ``SimpleUDPClient.send_message``."""
+    from pythonosc import osc_message_builder
+
+    builder = osc_message_builder.OscMessageBuilder(address=address)
+    if isinstance(arguments, (list, tuple)):
+        for argument in arguments:
+            builder.add_arg(argument)
+    elif arguments is not None:
+        builder.add_arg(arguments)
+    return builder.build()
+
+
+class DestinationGroup:
+    """
+    Sends each OSC message or bundle to every address of a group spec from
+    one socket. Broadcast is always allowed; multicast uses the spec's TTL
+    and, if given, its outgoing interface. Has the ``send`` and
+    ``send_message`` methods of python-osc's ``SimpleUDPClient``, so the pool
+    uses it like any other sender.
+    """
+
+    def __init__(self, spec):
+        self.name = spec["name"]
+        family = socket.AF_INET6 if ":" in spec["addresses"][0][0] else socket.AF_INET
+        # resolved once; sendto would look a hostname up for every datagram
+        self.addresses = [socket.getaddrinfo(host, port, family, socket.SOCK_DGRAM)[0][4] for host, port in spec["addresses"]]
+        self._sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            if family == socket.AF_INET:
+                self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
+                self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, spec["ttl"])
+                if spec["interface"]:
+                    self._sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton(spec["interface"]))
+            else:
+                self._sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_MULTICAST_HOPS, spec["ttl"])
+                if spec["interface"]:
+                    interface = spec["interface"]
+                    index = int(interface) if interface.isdigit() else socket.if_nametoindex(interface)
+                    self._sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_MULTICAST_IF, index)
+        except OSError:
+            self._sock.close()
+            raise
+
+    def send(self, content):
+        """Sends the datagram of a built message or bundle to every address."""
+        dgram = content.dgram
+        error = None
+        for address in self.addresses:
+            try:
+                self._sock.sendto(dgram, address)
+            except OSError as e:
+                error = error or e
+        if error is not None:
+            raise error
+
+    def send_message(self, address, arguments):
+        self.send(build_message(address, arguments))
+
+    def close(self):
+        self._sock.close()
+
+
+class SenderPool:
+    """
+    Pool of OSC UDP senders keyed by ``(client_ip, client_port)`` with
+    per-destination ``sent`` and ``errors`` counters.
+    """
+
+    def __init__(self):
+        self._senders = {}
+        self._counters = {}
+        self._groups = {}  # group name -> spec
+        self._lock = threading.Lock()
+
+    def open(self, clients):
+        """Creates a sender for every destination in ``clients`` up front."""
+        for client in clients:
+            try:
+                self.get(client["client_ip"], client["client_port"])
+            except OSError as e:
+                print(f"Could not open OSC sender for {client['client_ip']}:{client['client_port']}: {e}")
+
+    def get(self, client_ip, client_port):
+        """Returns the sender for a destination, creating it on first use."""
+        key = (client_ip, client_port)
+        sender = self._senders.get(key)
+        if sender is None:
+            with self._lock:
+                sender = self._senders.get(key)
+                if sender is None:
+                    if client_ip.startswith(GROUP_PREFIX):
+                        spec = self._groups.get(client_ip[len(GROUP_PREFIX):])
+                        if spec is None:
+                            raise OSError(f"No destination group named '{client_ip[len(GROUP_PREFIX):]}'")
+                        sender = DestinationGroup(spec)
+                    else:
+                        from pythonosc import udp_client
+
+                        sender = udp_client.SimpleUDPClient(client_ip, client_port)
+                    self._senders[key] = sender
+                    self._counters.setdefault(key, {"sent": 0, "errors": 0})
+        return sender
+
+    def send_message(self, client_ip, client_port, address, arguments):
+        """Sends one OSC message through the pooled sender for the destination."""
+        key = (client_ip, client_port)
+        try:
+            self.get(client_ip, client_port).send_message(address, arguments)
+        except Exception:
+            self._counters.setdefault(key, {"sent": 0, "errors": 0})["errors"] += 1
+            raise
+        self._counters[key]["sent"] += 1
+
+    def send(self, client_ip, client_port, content):
+        """Sends a prebuilt ``OscMessage`` or ``OscBundle`` to the destination."""
+        key = (client_ip, client_port)
+        try:
+            self.get(client_ip, client_port).send(content)
+        except Exception:
+            self._counters.setdefault(key, {"sent": 0, "errors": 0})["errors"] += 1
+            raise
+        self._counters[key]["sent"] += 1
+
+    def stats(self):
+        """Returns a copy of the per-destination counters."""
+        return {key: dict(counters) for key, counters in self._counters.items()}
+
+    def configure_groups(self, specs):
+        """
+        Replaces the destination group specs. The senders of groups that
+        changed or were removed are closed; the next message reopens them.
+        """
+        groups = {spec["name"]: spec for spec in specs}
+        with self._lock:
+            changed = {name for name in set(self._groups) | set(groups) if self._groups.get(name) != groups.get(name)}
+            self._groups = groups
+            stale = [self._senders.pop(key) for key in list(self._senders) if key[0].startswith(GROUP_PREFIX) and key[0][len(GROUP_PREFIX):] in changed]
+        for sender in stale:
+            self._close(sender)
+
+    def retain(self, clients):
+        """Closes the senders of destinations that none of ``clients`` uses any more."""
+        keep = {(client["client_ip"], client["client_port"]) for client in clients}
+        with self._lock:
+            unused = [self._senders.pop(key) for key in list(self._senders) if key not in keep]
+        for sender in unused:
+            self._close(sender)
+
+    def close(self):
+        """Closes every pooled socket. The pool can be reopened afterwards."""
+        with self._lock:
+            senders = list(self._senders.values())
+            self._senders.clear()
+        for sender in senders:
+            self._close(sender)
+
+    def _close(self, sender):
+        try:
+            # older python-osc releases have no close(); the socket is still there
+            close = getattr(sender, "close", None) or sender._sock.close
+            close()
+        except OSError:
+            pass
+
+    def __len__(self):
+        return len(self._senders)
+
+
+class OutboundBatcher:
+    """
+    Collects outgoing messages per destination until ``flush`` is called, then
+    sends each destination's messages as one OSC bundle. The bundle timetag is
+    the time the first message of the batch was queued, which receivers treat
+    as "now". With ``coalesce`` only the latest arguments per address are kept.
+
+    Until the next flush a destination holds at most ``backlog`` messages and
+    all destinations together ``maxsize``; ``policy`` decides which message is
+    ``dropped`` beyond that, as in ``SendWorker``. Errors building or sending
+    a destination's bundles go to ``log`` when one is given and are counted as
+    ``send_errors`` in ``metrics``.
+    """
+
+    def __init__(self, pool, coalesce=False, maxsize=4096, backlog=256, policy="drop_oldest", metrics=None, log=None):
+        self.pool = pool
+        self.coalesce = coalesce
+        self.metrics = metrics
+        self.log = log
+        self.maxsize = maxsize
+        self.backlog = backlog
+        self.policy = policy
+        self._pending = {}  # (client_ip, client_port) -> [opened at, {address: arguments} or [(address, arguments)]]
+        self._size = 0
+        self._lock = threading.Lock()
+        self.counters = {"queued": 0, "coalesced": 0, "dropped": 0, "bundles": 0, "messages": 0}
+
+    def configure(self, maxsize, backlog, policy):
+        """Changes the limits and overflow policy. Already queued messages are kept."""
+        with self._lock:
+            self.maxsize = maxsize
+            self.backlog = backlog
+            self.policy = policy
+
+    def add(self, client_ip, client_port, address, arguments):
+        """Queues one message for the next flush."""
+        key = (client_ip, client_port)
+        with self._lock:
+            batch = self._pending.get(key)
+            if batch is None:
+                batch = self._pending[key] = [time.time(), {} if self.coalesce else []]
+            messages = batch[1]
+            # a batch opened before ``coalesce`` changed keeps its own container until it is flushed
+            coalesce = isinstance(messages, dict)
+            self.counters["queued"] += 1
+            if coalesce and address in messages:
+                # re-insert so the address moves to the position of its latest update
+                del messages[address]
+                self.counters["coalesced"] += 1
+                self._size -= 1
+            elif len(messages) >= self.backlog or self._size >= self.maxsize:
+                self.counters["dropped"] += 1
+                if self.policy == "drop_newest" or not messages:
+                    return
+                if coalesce:
+                    del messages[next(iter(messages))]
+                else:
+                    del messages[0]
+                self._size -= 1
+            if coalesce:
+                messages[address] = arguments
+            else:
+                messages.append((address, arguments))
+            self._size += 1
+
+    def retain(self, clients):
+        """Drops the messages queued for destinations that none of ``clients`` uses any more."""
+        keep = {(client["client_ip"], client["client_port"]) for client in clients}
+        with self._lock:
+            for key in [key for key in self._pending if key not in keep]:
+                dropped = len(self._pending.pop(key)[1])
+                self.counters["dropped"] += dropped
+                self._size -= dropped
+
+    def flush(self, send=None):
+        """
+        Builds everything queued since the last flush into bundles and passes
+        each to ``send(client_ip, client_port, content)``. Without ``send``
+        they are sent through the pool right away.
+        """
+        send = send or self.pool.send
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._size = 0
+        for (client_ip, client_port), (opened_at, messages) in pending.items():
+            if isinstance(messages, dict):
+                messages = messages.items()
+            try:
+                for content in self._build(opened_at, messages):
+                    send(client_ip, client_port, content)
+            except Exception as e:
+                if self.metrics is not None and self.metrics.enabled:
+                    self.metrics.count("send_errors")
+                error = f"Error sending OSC bundle to {client_ip}:{client_port}: {e}"
+                if self.log is not None:
+                    self.log.error(error, key=f"send errors to {client_ip}:{client_port}")
+                else:
+                    print(error)
+
+    def _build(self, timestamp, messages):
+        from pythonosc import osc_bundle_builder
+
+        built = [build_message(address, arguments) for address, arguments in messages]
+        self.counters["messages"] += len(built)
+
+        # a lone message is sent as-is; receivers without bundle support still get it
+        if len(built) == 1:
+            return built
+
+        contents = []
+        bundle = None
+        size = 0
+        for message in built:
+            if bundle is None or size + message.size + 4 > MAX_BUNDLE_SIZE:
+                if bundle is not None:
+                    contents.append(bundle.build())
+                bundle = osc_bundle_builder.OscBundleBuilder(timestamp)
+                size = 16  # "#bundle" tag and timetag
+            bundle.add_content(message)
+            size += message.size + 4
+        contents.append(bundle.build())
+        self.counters["bundles"] += len(contents)
+        return contents
+
+
+class SendFilter:
+    """
+    Change detection per send source and an optional minimum interval per
+    ``(client_ip, client_port, address)``. Within an interval the first
+    message is sent right away; later ones replace each other and the latest
+    is returned by ``due`` when the interval ends. Counts ``unchanged`` updates
+    and ``debounced`` messages that were replaced before they were sent.
+    """
+
+    def __init__(self):
+        self._last_text = {}  # send source name -> text of its last update
+        self._windows = {}  # (client_ip, client_port, address) -> [interval end, interval, held arguments or None]
+        self._lock = threading.Lock()
+        self.counters = {"unchanged": 0, "debounced": 0}
+
+    def changed(self, source_name, text):
+        """Returns False if ``text`` is the same as the source's previous update."""
+        if self._last_text.get(source_name) == text:
+            self.counters["unchanged"] += 1
+            return False
+        self._last_text[source_name] = text
+        return True
+
+    def allow(self, client_ip, client_port, address, arguments, interval):
+        """
+        Returns True if the message can be sent now. Otherwise it is held
+        (replacing any held message for the same address) until ``due``.
+        ``interval`` is in seconds.
+        """
+        key = (client_ip, client_port, address)
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now >= window[0]:
+                self._windows[key] = [now + interval, interval, None]
+                return True
+            if window[2] is not None:
+                self.counters["debounced"] += 1
+            window[2] = arguments
+            return False
+
+    def due(self):
+        """Returns the held messages whose interval has ended as ``(client_ip, client_port, address, arguments)``."""
+        ready = []
+        now = time.monotonic()
+        with self._lock:
+            for key, window in list(self._windows.items()):
+                if now < window[0]:
+                    continue
+                if window[2] is None:
+                    del self._windows[key]
+                else:
+                    ready.append(key + (window[2],))
+                    # the held message starts a new interval
+                    self._windows[key] = [now + window[1], window[1], None]
+        return ready
+
+    def clear(self):
+        """Forgets the last texts and drops every held message."""
+        with self._lock:
+            self._last_text.clear()
+            self._windows.clear()
+
+
+class SendWorker:
+    """
+    Bounded queue of outgoing messages, sent by a background thread through a
+    ``SenderPool``. Each destination has its own backlog and the thread takes
+    one message from each destination in turn, so a destination that is slow
+    to resolve or failing only fills its own backlog.
+
+    When a backlog reaches ``backlog`` messages, or all backlogs together reach
+    ``maxsize``, the overflow policy decides what is lost: ``drop_oldest``
+    discards the destination's oldest queued message and ``drop_newest`` the
+    message being added. A failed send is retried up to ``retries`` times,
+    waiting ``RETRY_DELAY`` (doubled each time) while the other destinations
+    carry on. ``flush`` has the thread build the bundles queued in ``batcher``
+    and queue each one like a message, so bundles share the same backlogs,
+    limits and retries. ``configure`` applies the limits to ``batcher`` too.
+
+    Counts ``queued``, ``sent``, ``dropped``, ``retried`` and ``failed``
+    messages and bundles. With ``metrics`` enabled it also counts the messages
+    ``sent``, those in a bundle one by one, and records the time from ``submit``
+    to sent as ``queued_to_sent``. Send errors go to ``log`` when one is given.
+    """
+
+    def __init__(self, pool, batcher=None, metrics=None, log=None, maxsize=4096, backlog=256, policy="drop_oldest", retries=0):
+        self.pool = pool
+        self.batcher = batcher
+        self.metrics = metrics
+        self.log = log
+        self.maxsize = maxsize
+        self.backlog = backlog
+        self.policy = policy
+        self.retries = retries
+        self.counters = {"queued": 0, "sent": 0, "dropped": 0, "retried": 0, "failed": 0}
+        self._backlogs = {}  # (client_ip, client_port) -> deque of [address, arguments, queued at, attempts]; address None for a built bundle
+        self._ready = collections.deque()  # destinations with queued messages, in turn
+        self._retry_at = {}  # destination -> monotonic time its failed message is retried
+        self._size = 0
+        self._flush_requested = False
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._thread = None
+
+    def configure(self, maxsize, backlog, policy, retries):
+        """Changes the queue limits, overflow policy and retries. Already queued messages are kept."""
+        if policy not in SEND_OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{policy}'")
+        with self._condition:
+            self.maxsize = max(1, maxsize)
+            self.backlog = max(1, backlog)
+            self.policy = policy
+            self.retries = max(0, retries)
+        if self.batcher is not None:
+            self.batcher.configure(self.maxsize, self.backlog, policy)
+
+    def submit(self, client_ip, client_port, address, arguments):
+        """Queues one message for the destination. Returns False if it was dropped."""
+        return self._put(client_ip, client_port, address, arguments)
+
+    def _put_built(self, client_ip, client_port, content):
+        # a bundle (or lone message) built by the batcher
+        self._put(client_ip, client_port, None, content)
+
+    def _put(self, client_ip, client_port, address, arguments):
+        key = (client_ip, client_port)
+        queued_at = time.perf_counter() if self.metrics is not None and self.metrics.enabled else 0.0
+        with self._condition:
+            self.counters["queued"] += 1
+            backlog = self._backlogs.get(key)
+            if backlog is None:
+                backlog = self._backlogs[key] = collections.deque()
+            if len(backlog) >= self.backlog or self._size >= self.maxsize:
+                self.counters["dropped"] += 1
+                if self.policy == "drop_newest" or not backlog:
+                    return False
+                backlog.popleft()
+                self._size -= 1
+            backlog.append([address, arguments, queued_at, 0])
+            self._size += 1
+            if len(backlog) == 1 and key not in self._retry_at:
+                self._ready.append(key)
+            self._start()
+            self._condition.notify()
+        return True
+
+    def flush(self):
+        """Has the thread send everything queued in ``batcher``."""
+        with self._condition:
+            self._flush_requested = True
+            self._start()
+            self._condition.notify()
+
+    def retain(self, clients):
+        """
+        Drops the messages queued here and in ``batcher`` for destinations that
+        none of ``clients`` uses any more, before their senders are closed.
+        """
+        keep = {(client["client_ip"], client["client_port"]) for client in clients}
+        with self._condition:
+            for key in [key for key in self._backlogs if key not in keep]:
+                dropped = len(self._backlogs.pop(key))
+                self.counters["dropped"] += dropped
+                self._size -= dropped
+                self._retry_at.pop(key, None)
+        if self.batcher is not None:
+            self.batcher.retain(clients)
+
+    def stats(self):
+        """Returns a copy of the counters with the number of messages still queued."""
+        return dict(self.counters, backlog=self._size)
+
+    def stop(self, timeout=STOP_TIMEOUT):
+        """
+        Sends what is still queued, for at most ``timeout`` seconds, and stops
+        the thread. Messages left after that are dropped. ``submit`` starts it again.
+        """
+        with self._condition:
+            thread, self._thread = self._thread, None
+            self._stopping = True
+            self._flush_requested = self.batcher is not None
+            self._condition.notify()
+        if thread is not None:
+            thread.join(timeout)
+        elif self.batcher is not None:
+            self.batcher.flush()
+        with self._condition:
+            self.counters["dropped"] += self._size
+            self._backlogs.clear()
+            self._ready.clear()
+            self._retry_at.clear()
+            self._size = 0
+            self._flush_requested = False
+            self._stopping = False
+
+    def _start(self):
+        if self._thread is None and not self._stopping:
+            self._thread = threading.Thread(target=self._run, name="OSC IO sender", daemon=True)
+            self._thread.start()
+
+    def _next(self):
+        """Returns the next ``(destination, message)`` to send, ``None`` to wait, or ``False`` to stop."""
+        while True:
+            now = time.monotonic()
+            for key, retry_at in list(self._retry_at.items()):
+                if retry_at <= now or self._stopping:
+                    del self._retry_at[key]
+                    self._ready.append(key)
+            if self._flush_requested:
+                return None
+            if not self._ready:
+                return False if self._stopping else None
+            key = self._ready.popleft()
+            backlog = self._backlogs.get(key)
+            if backlog and key not in self._retry_at:
+                self._size -= 1
+                return key, backlog.popleft()
+
+    def _run(self):
+        thread = threading.current_thread()
+        while True:
+            with self._condition:
+                while True:
+                    if self._thread is not thread and not self._stopping:
+                        return  # a stop timed out while this thread was sending
+                    job = self._next()
+                    if job is not None or self._flush_requested:
+                        break
+                    self._condition.wait(min(self._retry_at.values(), default=time.monotonic() + 1.0) - time.monotonic())
+                flush, self._flush_requested = self._flush_requested, False
+            if flush:
+                self.batcher.flush(self._put_built)
+            if job is False:
+                return
+            if job:
+                self._send(*job)
+
+    def _send(self, key, message):
+        address, arguments, queued_at, attempts = message
+        try:
+            if address is None:
+                self.pool.send(key[0], key[1], arguments)
+            else:
+                self.pool.send_message(key[0], key[1], address, arguments)
+        except Exception as e:
+            with self._condition:
+                # not retried once ``retain`` has dropped the destination
+                if attempts < self.retries and not self._stopping and key in self._backlogs:
+                    message[3] += 1
+                    self.counters["retried"] += 1
+                    self._backlogs.setdefault(key, collections.deque()).appendleft(message)
+                    self._size += 1
+                    self._retry_at[key] = time.monotonic() + RETRY_DELAY * 2 ** attempts
+                    return
+                self.counters["failed"] += 1
+                if self._backlogs.get(key):
+                    self._ready.append(key)
+            if self.metrics is not None and self.metrics.enabled:
+                self.metrics.count("send_errors")
+            error = f"Error sending OSC message to {key[0]}:{key[1]}: {e}"
+            if self.log is not None:
+                self.log.error(error, key=f"send errors to {key[0]}:{key[1]}")
+            else:
+                print(error)
+            return
+        with self._condition:
+            self.counters["sent"] += 1
+            if self._backlogs.get(key):
+                self._ready.append(key)
+        if self.metrics is not None and self.metrics.enabled:
+            # a bundle counts as the messages in it
+            self.metrics.count("sent", getattr(arguments, "num_contents", 1) if address is None else 1)
+        if queued_at and self.metrics is not None:
+            self.metrics.observe("queued_to_sent", time.perf_counter() - queued_at)
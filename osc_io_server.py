@@ -0,0 +1,342 @@
+"""
+OSC IO: Server Engines
+======================
+
+Selectable OSC UDP server implementations. All engines share the interface of
+python-osc's socketserver based servers (``serve_forever``, ``shutdown``,
+``server_close`` and ``server_address``), so the scripts start and stop them
+the same way.
+
+* ``threading``: one new thread per datagram, like python-osc's ``ThreadingOSCUDPServer``.
+* ``single``: one thread that reads every ready datagram into a reusable buffer
+  and dispatches it in-line.
+* ``asyncio``: a datagram endpoint on its own event loop, like python-osc's
+  ``AsyncIOOSCUDPServer``.
+
+Stopping never waits for a poll interval: the ``single`` and ``threading``
+read loops also wait on a wake-up socket that ``shutdown`` writes to, and the
+asyncio loop is woken by ``call_soon_threadsafe``. Sockets are bound with
+``SO_REUSEADDR`` (except on Windows) so a restarted server gets its port back.
+
+A ``ListenerGroup`` runs one server per configured ``ip:port`` (each with its
+own receive buffer size and optional allow-list of sender IPs), all feeding
+the same dispatcher, and counts packets and bytes per listener.
+
+asyncio is imported by the engine that uses it, when a server is created.
+"""
+
+import os
+import select
+import socket
+import threading
+
+SERVER_ENGINES = [
+    ("Single Thread (batched reads)", "single"),
+    ("asyncio", "asyncio"),
+    ("Thread per Packet", "threading"),
+]
+
+DEFAULT_BUFFER_SIZE = 65536  # largest UDP payload
+DEFAULT_BATCH_SIZE = 64  # datagrams read per wake-up before checking for shutdown
+
+
+def parse_listener(text):
+    """
+    Parses a listener line ``ip:port [rcvbuf=KB] [allow=ip,ip]`` into a spec
+    dictionary. IPv6 addresses are written in brackets, e.g. ``[::1]:9000``.
+    """
+    parts = text.split()
+    if not parts:
+        raise ValueError("Empty listener")
+    host, separator, port = parts[0].rpartition(":")
+    if not separator or not port.isdigit() or not 0 <= int(port) <= 65535:
+        raise ValueError(f"Listener '{parts[0]}' must be ip:port")
+    spec = {"ip": host.strip("[]") or "0.0.0.0", "port": int(port), "rcvbuf_kb": 0, "allow": []}
+    for option in parts[1:]:
+        name, _, value = option.partition("=")
+        if name == "rcvbuf" and value.isdigit():
+            spec["rcvbuf_kb"] = int(value)
+        elif name == "allow" and value:
+            spec["allow"] = [ip for ip in value.split(",") if ip]
+        else:
+            raise ValueError(f"Unknown listener option '{option}'")
+    return spec
+
+
+def create_server(engine, server_address, dispatcher, reuse_address=True):
+    """Creates and binds a server for ``engine``. Raises ``OSError`` if binding fails."""
+    if engine == "single":
+        return BatchOSCUDPServer(server_address, dispatcher, reuse_address=reuse_address)
+    if engine == "asyncio":
+        return AsyncioOSCUDPServer(server_address, dispatcher, reuse_address)
+    if engine == "threading":
+        return ThreadingOSCUDPServer(server_address, dispatcher, reuse_address)
+    raise ValueError(f"Unknown OSC server engine '{engine}'")
+
+
+def bind_socket(server_address, reuse_address=True):
+    """
+    Creates a UDP socket bound to ``server_address``. Raises ``OSError`` if
+    binding fails. With ``reuse_address`` the port can be bound again while a
+    previous socket on it is still open, e.g. inherited by a forked process.
+    On Windows the option lets any other program take over the port, so it is
+    not set there.
+    """
+    family = socket.AF_INET6 if ":" in server_address[0] else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    try:
+        if reuse_address and os.name != "nt":
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(server_address)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+class BatchOSCUDPServer:
+    """
+    Single threaded OSC UDP server. Each wake-up drains up to ``batch_size``
+    datagrams with ``recvfrom_into`` on one preallocated buffer and calls the
+    dispatcher directly, so no thread is created per packet.
+    """
+
+    def __init__(self, server_address, dispatcher, buffer_size=DEFAULT_BUFFER_SIZE, batch_size=DEFAULT_BATCH_SIZE, reuse_address=True):
+        self.socket = bind_socket(server_address, reuse_address)
+        self.socket.setblocking(False)
+        self.server_address = self.socket.getsockname()
+        self.dispatcher = dispatcher
+        self.batch_size = batch_size
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_writer.setblocking(False)
+        self._stop = threading.Event()
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+    def serve_forever(self, poll_interval=None):
+        """Reads and dispatches datagrams until ``shutdown`` is called."""
+        self._stopped.clear()
+        try:
+            while not self._stop.is_set():
+                ready, _, _ = select.select([self.socket, self._wake_reader], [], [], poll_interval)
+                if self.socket in ready:
+                    self._read_batch()
+        finally:
+            self._stopped.set()
+
+    def _read_batch(self):
+        for _ in range(self.batch_size):
+            try:
+                size, client_address = self.socket.recvfrom_into(self._buffer)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # e.g. ICMP port unreachable reported on Windows; keep serving
+                return
+            self._dispatch(bytes(self._view[:size]), client_address)
+
+    def _dispatch(self, data, client_address):
+        try:
+            self.dispatcher.call_handlers_for_packet(data, client_address)
+        except Exception as e:
+            print(f"Error dispatching OSC packet from {client_address}: {e}")
+
+    def shutdown(self):
+        """Wakes ``serve_forever`` up, stops it and waits for it to return."""
+        self._stop.set()
+        try:
+            self._wake_writer.send(b"\0")
+        except OSError:
+            pass  # already woken, or closed
+        self._stopped.wait()
+
+    def server_close(self):
+        """Closes the listening socket."""
+        self.socket.close()
+        self._wake_reader.close()
+        self._wake_writer.close()
+
+
+class ThreadingOSCUDPServer(BatchOSCUDPServer):
+    """
+    Dispatches every datagram on a new thread, like python-osc's
+    ``ThreadingOSCUDPServer``, but reads them in the wake-able loop of
+    ``BatchOSCUDPServer``. ``server_close`` waits for the packet threads.
+    """
+
+    def __init__(self, server_address, dispatcher, reuse_address=True):
+        super().__init__(server_address, dispatcher, reuse_address=reuse_address)
+        self._threads = []
+
+    def _dispatch(self, data, client_address):
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        thread = threading.Thread(target=super()._dispatch, args=(data, client_address), daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def server_close(self):
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        super().server_close()
+
+
+class AsyncioOSCUDPServer:
+    """
+    Runs a datagram endpoint on a private event loop, like python-osc's
+    ``AsyncIOOSCUDPServer``. The socket is bound in the constructor;
+    ``serve_forever`` runs the loop on the calling thread.
+    """
+
+    def __init__(self, server_address, dispatcher, reuse_address=True):
+        import asyncio
+
+        self.dispatcher = dispatcher
+        sock = bind_socket(server_address, reuse_address)
+        self._loop = asyncio.new_event_loop()
+        try:
+            self._transport, _ = self._loop.run_until_complete(
+                self._loop.create_datagram_endpoint(lambda: DatagramProtocol(dispatcher), sock=sock))
+        except OSError:
+            sock.close()
+            self._loop.close()
+            raise
+        self.server_address = self._transport.get_extra_info("sockname")
+        self.socket = self._transport.get_extra_info("socket")
+        self._stopped = threading.Event()
+        self._stopped.set()
+
+    def serve_forever(self):
+        """Runs the event loop until ``shutdown`` is called."""
+        import asyncio
+
+        self._stopped.clear()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._stopped.set()
+
+    def shutdown(self):
+        """Stops the event loop and waits for ``serve_forever`` to return."""
+        if not self._loop.is_closed():
+            # queued even if the loop has not started yet, so it stops right away
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._stopped.wait()
+
+    def server_close(self):
+        """Closes the endpoint and the event loop."""
+        import asyncio
+
+        self._transport.close()
+        if not self._loop.is_closed():
+            # let the transport finish closing before the loop goes away
+            self._loop.run_until_complete(asyncio.sleep(0))
+            self._loop.close()
+
+
+class DatagramProtocol:
+    """asyncio datagram protocol that hands every datagram to the dispatcher."""
+
+    def __init__(self, dispatcher):
+        self.dispatcher = dispatcher
+
+    def connection_made(self, transport):
+        pass
+
+    def datagram_received(self, data, client_address):
+        try:
+            self.dispatcher.call_handlers_for_packet(data, client_address)
+        except Exception as e:
+            print(f"Error dispatching OSC packet from {client_address}: {e}")
+
+    def error_received(self, exc):
+        pass  # e.g. ICMP port unreachable reported on Windows; keep serving
+
+    def connection_lost(self, exc):
+        pass
+
+
+class ListenerDispatcher:
+    """
+    Stands in for the shared dispatcher on one listener: drops datagrams from
+    senders outside the allow-list and counts the rest before dispatching.
+    """
+
+    def __init__(self, dispatcher, allow=None):
+        self.dispatcher = dispatcher
+        self.allow = frozenset(allow) if allow else None
+        self.counters = {"packets": 0, "bytes": 0, "rejected": 0}
+
+    def call_handlers_for_packet(self, data, client_address):
+        if self.allow is not None and client_address[0] not in self.allow:
+            self.counters["rejected"] += 1
+            return []
+        self.counters["packets"] += 1
+        self.counters["bytes"] += len(data)
+        return self.dispatcher.call_handlers_for_packet(data, client_address)
+
+
+class ListenerGroup:
+    """
+    Set of listeners started and stopped together. Each listener is a server
+    from ``create_server`` running on its own thread.
+    """
+
+    def __init__(self):
+        self._listeners = []  # (name, server, thread, ListenerDispatcher)
+        self.engine = None
+        self.errors = {}  # name -> why it could not start, for the last start
+
+    def start(self, engine, specs, dispatcher, reuse_address=True):
+        """
+        Binds and starts a listener per spec. Listeners that fail to bind are
+        reported, kept in ``errors`` and skipped. Returns the number of
+        listeners running.
+        """
+        self.engine = engine
+        self.errors = {}
+        for spec in specs:
+            name = f"{spec['ip']}:{spec['port']}"
+            listener_dispatcher = ListenerDispatcher(dispatcher, spec.get("allow"))
+            try:
+                server = create_server(engine, (spec["ip"], spec["port"]), listener_dispatcher, reuse_address)
+            except (OSError, ValueError) as e:
+                print(f"OSC listener {name} could not start: {e}")
+                self.errors[name] = str(e)
+                continue
+            if spec.get("rcvbuf_kb"):
+                try:
+                    server.socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, spec["rcvbuf_kb"] * 1024)
+                except OSError as e:
+                    print(f"OSC listener {name} could not set receive buffer: {e}")
+            # name by the bound address so port 0 listeners stay distinct
+            name = f"{server.server_address[0]}:{server.server_address[1]}"
+            thread = threading.Thread(target=server.serve_forever, name=f"OSC listener {name}", daemon=True)
+            thread.start()
+            print(f"Serving on {server.server_address} ({engine})")
+            self._listeners.append((name, server, thread, listener_dispatcher))
+        return len(self._listeners)
+
+    def shutdown(self):
+        """Stops every listener, waits for its thread and closes its socket."""
+        listeners, self._listeners = self._listeners, []
+        self.errors = {}
+        for _, server, _, _ in listeners:
+            server.shutdown()
+        for _, server, thread, _ in listeners:
+            thread.join()
+            server.server_close()
+
+    def stats(self):
+        """Returns packet, byte and rejected counters per listener."""
+        return {name: dict(listener_dispatcher.counters) for name, _, _, listener_dispatcher in self._listeners}
+
+    @property
+    def server_addresses(self):
+        return [server.server_address for _, server, _, _ in self._listeners]
+
+    def __len__(self):
+        return len(self._listeners)
@@ -0,0 +1,281 @@
+"""
+OSC IO: Source Cache
+====================
+
+Caches resolved OBS sources by name so the receive path does not call
+``obs_get_source_by_name`` for every message. Entries are kept as weak source
+references, which do not keep a removed source alive, and are invalidated by
+OBS's global ``source_create``, ``source_rename`` and ``source_destroy``
+signals. Names that did not resolve are cached too, until a source with that
+name is created.
+
+``VisibilityTracker`` follows whether receive sources are showing (in program,
+preview or a projector) or live in program, so updates to hidden sources can
+be held back until they are seen.
+"""
+
+import itertools
+import threading
+
+import obspython as obs
+
+VISIBILITY_MODES = [
+    ("Always", "always"),
+    ("Only When Showing (Program, Preview or Projector)", "showing"),
+    ("Only When Live in Program", "active"),
+]
+VISIBILITY_SIGNALS = {"showing": ("show", "hide"), "active": ("activate", "deactivate")}
+
+
+class SourceCache:
+    """
+    Name to weak source reference cache. ``get`` returns a strong reference
+    that the caller releases with ``obs_source_release``, exactly like
+    ``obs_get_source_by_name``.
+    """
+
+    def __init__(self):
+        self._weak_sources = {}  # name -> weak source, or None if the name did not resolve
+        self._lock = threading.Lock()
+        self._connected = False
+        self.counters = {"hits": 0, "misses": 0, "invalidations": 0}
+        self.on_invalidate = []  # callables given the name of each invalidated entry
+        # keep the bound methods so disconnect receives the same callables
+        self._signal_callbacks = {
+            "source_create": self._on_source_create,
+            "source_rename": self._on_source_rename,
+            "source_destroy": self._on_source_destroy,
+        }
+
+    def connect(self):
+        """Starts listening for source create/rename/destroy signals."""
+        if not self._connected:
+            handler = obs.obs_get_signal_handler()
+            for signal, callback in self._signal_callbacks.items():
+                obs.signal_handler_connect(handler, signal, callback)
+            self._connected = True
+
+    def disconnect(self):
+        """Stops listening for source signals and drops every cached reference."""
+        if self._connected:
+            handler = obs.obs_get_signal_handler()
+            for signal, callback in self._signal_callbacks.items():
+                obs.signal_handler_disconnect(handler, signal, callback)
+            self._connected = False
+        self.clear()
+
+    def get(self, name):
+        """Returns a strong reference to the named source, or None."""
+        with self._lock:
+            if name in self._weak_sources:
+                weak_source = self._weak_sources[name]
+                if weak_source is None:
+                    self.counters["hits"] += 1
+                    return None
+                source = obs.obs_weak_source_get_source(weak_source)
+                if source is not None:
+                    self.counters["hits"] += 1
+                    return source
+                # the source is gone but its destroy signal has not arrived yet
+                obs.obs_weak_source_release(weak_source)
+                del self._weak_sources[name]
+
+            self.counters["misses"] += 1
+            source = obs.obs_get_source_by_name(name)
+            self._weak_sources[name] = obs.obs_source_get_weak_source(source) if source is not None else None
+            return source
+
+    def invalidate(self, name):
+        """Forgets the cached entry for ``name``."""
+        with self._lock:
+            if name in self._weak_sources:
+                weak_source = self._weak_sources.pop(name)
+                if weak_source is not None:
+                    obs.obs_weak_source_release(weak_source)
+                self.counters["invalidations"] += 1
+        for callback in self.on_invalidate:
+            callback(name)
+
+    def clear(self):
+        """Forgets every cached entry."""
+        with self._lock:
+            for weak_source in self._weak_sources.values():
+                if weak_source is not None:
+                    obs.obs_weak_source_release(weak_source)
+            self._weak_sources.clear()
+
+    def _on_source_create(self, calldata):
+        self.invalidate(obs.obs_source_get_name(obs.calldata_source(calldata, "source")))
+
+    def _on_source_rename(self, calldata):
+        self.invalidate(obs.calldata_string(calldata, "prev_name"))
+        self.invalidate(obs.calldata_string(calldata, "new_name"))
+
+    def _on_source_destroy(self, calldata):
+        self.invalidate(obs.obs_source_get_name(obs.calldata_source(calldata, "source")))
+
+
+class VisibilityTracker:
+    """
+    Holds back updates to receive sources that are not visible. In the
+    ``showing`` and ``active`` modes a source is tracked the first time
+    ``visible`` is asked about it: its ``show``/``hide`` (or
+    ``activate``/``deactivate``) signals are connected and its current state
+    read. Sources that do not exist count as visible.
+
+    ``hold`` keeps only the latest message per key for a hidden source, and
+    every message held without a key, up to ``maxsize`` per source; beyond
+    that ``policy`` drops the source's oldest held message (``drop_oldest``)
+    or the new one (``drop_newest``), as in ``ReceiveQueue``.
+    Visibility signals can arrive from any OBS thread, so they only record the
+    change; ``release`` returns the held messages of sources that became
+    visible, for the OBS tick to apply. Counts ``held`` messages, ``replaced``
+    ones superseded while hidden, ``dropped`` ones and ``released`` ones.
+    """
+
+    def __init__(self, source_cache):
+        self.source_cache = source_cache
+        self.mode = "always"
+        self.maxsize = 1024
+        self.policy = "drop_oldest"
+        self.counters = {"held": 0, "replaced": 0, "dropped": 0, "released": 0}
+        self._visible = {}  # tracked source name -> visible
+        self._weak_sources = {}  # tracked source name -> weak source, to disconnect its signals
+        self._held = {}  # source name -> {key: message}
+        self._shown = set()  # names with held messages that became visible
+        self._unkeyed = itertools.count()  # keys for messages that are never replaced
+        self._lock = threading.Lock()
+        self._signal_callbacks = {"show": self._on_show, "hide": self._on_hide, "activate": self._on_show, "deactivate": self._on_hide}
+        source_cache.on_invalidate.append(self.forget)
+
+    def configure(self, mode, maxsize=1024, policy="drop_oldest"):
+        """
+        Changes the mode and the per-source limit. Leaving a mode disconnects
+        every source and releases what was held.
+        """
+        if mode != "always" and mode not in VISIBILITY_SIGNALS:
+            raise ValueError(f"Unknown visibility mode '{mode}'")
+        with self._lock:
+            self.maxsize = max(1, maxsize)
+            self.policy = policy
+        if mode != self.mode:
+            self.clear()
+            self.mode = mode
+
+    def visible(self, name):
+        """Returns False if updates to the named source should be held."""
+        if self.mode == "always":
+            return True
+        visible = self._visible.get(name)
+        if visible is None:
+            visible = self._track(name)
+        return visible
+
+    def hold(self, name, key, message):
+        """
+        Keeps ``message`` for the hidden source, replacing the one held under
+        ``key``. With ``key`` None it is kept alongside everything else held.
+        Returns False if the source's limit dropped it.
+        """
+        with self._lock:
+            if key is None:
+                key = next(self._unkeyed)
+            held = self._held.setdefault(name, {})
+            if held.pop(key, None) is not None:
+                self.counters["replaced"] += 1
+            elif len(held) >= self.maxsize:
+                self.counters["dropped"] += 1
+                if self.policy == "drop_newest":
+                    return False
+                del held[next(iter(held))]
+            held[key] = message
+            self.counters["held"] += 1
+            if self._visible.get(name, True):
+                # shown again between the visible check and now
+                self._shown.add(name)
+        return True
+
+    def release(self):
+        """Returns the held messages of sources that became visible, oldest first."""
+        with self._lock:
+            if not self._shown:
+                return []
+            messages = []
+            for name in self._shown:
+                messages.extend(self._held.pop(name, {}).values())
+            self._shown.clear()
+        self.counters["released"] += len(messages)
+        return messages
+
+    def forget(self, name):
+        """Stops tracking a source (renamed, removed or recreated); what it held is released."""
+        with self._lock:
+            self._visible.pop(name, None)
+            weak_source = self._weak_sources.pop(name, None)
+            if name in self._held:
+                self._shown.add(name)
+        if weak_source is not None:
+            self._disconnect(weak_source)
+
+    def clear(self):
+        """Stops tracking every source and releases everything held."""
+        with self._lock:
+            weak_sources = list(self._weak_sources.values())
+            self._visible.clear()
+            self._weak_sources.clear()
+            self._shown.update(self._held)
+        for weak_source in weak_sources:
+            self._disconnect(weak_source)
+
+    def stats(self):
+        return dict(self.counters, tracked=len(self._visible), hidden=sum(not visible for visible in self._visible.values()))
+
+    def _track(self, name):
+        source = self.source_cache.get(name)
+        if source is None:
+            return True
+        handler = obs.obs_source_get_signal_handler(source)
+        for signal in VISIBILITY_SIGNALS[self.mode]:
+            obs.signal_handler_connect(handler, signal, self._signal_callbacks[signal])
+        visible = obs.obs_source_showing(source) if self.mode == "showing" else obs.obs_source_active(source)
+        with self._lock:
+            self._visible[name] = bool(visible)
+            self._weak_sources[name] = obs.obs_source_get_weak_source(source)
+        obs.obs_source_release(source)
+        return bool(visible)
+
+    def _disconnect(self, weak_source):
+        source = obs.obs_weak_source_get_source(weak_source)
+        if source is not None:
+            handler = obs.obs_source_get_signal_handler(source)
+            for signal, callback in self._signal_callbacks.items():
+                obs.signal_handler_disconnect(handler, signal, callback)
+            obs.obs_source_release(source)
+        obs.obs_weak_source_release(weak_source)
+
+    def _on_show(self, calldata):
+        name = obs.obs_source_get_name(obs.calldata_source(calldata, "source"))
+        with self._lock:
+            if name in self._visible:
+                self._visible[name] = True
+                if name in self._held:
+                    self._shown.add(name)
+
+    def _on_hide(self, calldata):
+        name = obs.obs_source_get_name(obs.calldata_source(calldata, "source"))
+        with self._lock:
+            if name in self._visible:
+                self._visible[name] = False
+
+
+def index_clients(clients, key):
+    """
+    Builds a reverse index from a source name in ``client[key]`` to the list of
+    clients that use it, so signal callbacks find their clients in O(1).
+    """
+    index = {}
+    for client in clients:
+        name = client.get(key)
+        if name:
+            index.setdefault(name, []).append(client)
+    return index
@@ -0,0 +1,335 @@
+"""
+OSC IO: WebSocket Transport
+===========================
+
+A small WebSocket server (standard library only) that pushes received OSC to
+browser sources without a ``javascript_event`` proc call per message.
+
+Pages connect to ``ws://127.0.0.1:<port>/?events=name1,name2`` (or send
+``{"subscribe": ["name"]}`` after connecting). Messages published for an event
+name during one OBS tick are sent to its subscribers as one text frame holding
+a JSON array of payloads.
+
+A subscriber that does not read fast enough is not allowed to hold up the
+others: once ``max_buffer`` bytes are waiting for it, further frames for it are
+dropped (and counted) until it catches up.
+"""
+
+import base64
+import hashlib
+import json
+import selectors
+import socket
+import struct
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+DEFAULT_MAX_BUFFER = 1024 * 1024  # bytes waiting per subscriber before frames are dropped
+MAX_HANDSHAKE_SIZE = 8192
+
+
+def encode_frame(payload, opcode=0x1):
+    """Returns an unmasked (server to client) WebSocket frame."""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 65536:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def decode_frame(buffer):
+    """
+    Parses one masked (client to server) frame from the start of ``buffer``.
+    Returns ``(opcode, payload, frame size)``, or None if the frame is incomplete.
+    """
+    if len(buffer) < 2:
+        return None
+    opcode = buffer[0] & 0x0F
+    masked = buffer[1] & 0x80
+    length = buffer[1] & 0x7F
+    offset = 2
+    if length == 126:
+        if len(buffer) < 4:
+            return None
+        length = struct.unpack_from("!H", buffer, 2)[0]
+        offset = 4
+    elif length == 127:
+        if len(buffer) < 10:
+            return None
+        length = struct.unpack_from("!Q", buffer, 2)[0]
+        offset = 10
+    mask = b""
+    if masked:
+        mask = bytes(buffer[offset:offset + 4])
+        offset += 4
+    if len(buffer) < offset + length:
+        return None
+    payload = bytes(buffer[offset:offset + length])
+    if masked:
+        payload = bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    return opcode, payload, offset + length
+
+
+class _Connection:
+    def __init__(self, sock, address):
+        self.socket = sock
+        self.address = address
+        self.inbox = bytearray()
+        self.outbox = bytearray()
+        self.open = False  # handshake done
+        self.events = set()
+        self.dropped = 0
+
+
+class WebSocketHub:
+    """
+    WebSocket server on its own thread. ``publish`` and ``flush`` are called
+    from OBS; all socket I/O happens on the hub thread.
+    """
+
+    def __init__(self, max_buffer=DEFAULT_MAX_BUFFER):
+        self.max_buffer = max_buffer
+        self.counters = {"connections": 0, "frames": 0, "messages": 0, "dropped_frames": 0}
+        self._connections = {}  # socket -> _Connection
+        self._subscribers = {}  # event name -> set of _Connection
+        self._pending = {}  # event name -> [payload, ...] published since the last flush
+        self._lock = threading.Lock()
+        self._selector = None
+        self._listener = None
+        self._wake_reader = None
+        self._wake_writer = None
+        self._thread = None
+        self._stop = False
+        self.server_address = None
+
+    @property
+    def running(self):
+        return self._thread is not None
+
+    def start(self, ip, port):
+        """Binds ``ip:port`` and starts the hub thread. Raises ``OSError`` if binding fails."""
+        self.stop()
+        family = socket.AF_INET6 if ":" in ip else socket.AF_INET
+        listener = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            listener.bind((ip, port))
+            listener.listen()
+        except OSError:
+            listener.close()
+            raise
+        listener.setblocking(False)
+        self._listener = listener
+        self.server_address = listener.getsockname()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._wake_reader.setblocking(False)
+        self._wake_writer.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(listener, selectors.EVENT_READ)
+        self._selector.register(self._wake_reader, selectors.EVENT_READ)
+        self._stop = False
+        self._thread = threading.Thread(target=self._run, name="OSC IO WebSocket", daemon=True)
+        self._thread.start()
+        print(f"WebSocket transport on ws://{ip}:{self.server_address[1]}/")
+
+    def stop(self):
+        """Closes every connection and stops the hub thread."""
+        if self._thread is None:
+            return
+        self._stop = True
+        self._wake()
+        self._thread.join()
+        self._thread = None
+        for conn in list(self._connections.values()):
+            self._close(conn)
+        self._selector.close()
+        self._listener.close()
+        self._wake_reader.close()
+        self._wake_writer.close()
+        with self._lock:
+            self._pending.clear()
+            self._subscribers.clear()
+        self.server_address = None
+
+    def has_subscribers(self, event_name):
+        return bool(self._subscribers.get(event_name))
+
+    def publish(self, event_name, payload):
+        """Queues a JSON ``payload`` string for ``event_name`` until the next ``flush``."""
+        with self._lock:
+            self._pending.setdefault(event_name, []).append(payload)
+
+    def flush(self):
+        """Sends each event's queued payloads to its subscribers as one frame."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            for event_name, payloads in pending.items():
+                frame = encode_frame(("[" + ",".join(payloads) + "]").encode("utf-8"))
+                for conn in self._subscribers.get(event_name, ()):
+                    if len(conn.outbox) + len(frame) > self.max_buffer:
+                        conn.dropped += 1
+                        self.counters["dropped_frames"] += 1
+                        continue
+                    conn.outbox += frame
+                    self.counters["frames"] += 1
+                self.counters["messages"] += len(payloads)
+        self._wake()
+
+    def stats(self):
+        """Returns the hub counters and the subscribers per event name."""
+        with self._lock:
+            subscribers = {name: len(conns) for name, conns in self._subscribers.items() if conns}
+        return dict(self.counters, subscribers=subscribers)
+
+    def _wake(self):
+        try:
+            self._wake_writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass  # already awake or shutting down
+
+    def _run(self):
+        while not self._stop:
+            with self._lock:
+                for conn in self._connections.values():
+                    events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.outbox else 0)
+                    self._selector.modify(conn.socket, events, conn)
+            for key, events in self._selector.select(timeout=1.0):
+                if key.fileobj is self._listener:
+                    self._accept()
+                elif key.fileobj is self._wake_reader:
+                    try:
+                        self._wake_reader.recv(4096)
+                    except BlockingIOError:
+                        pass
+                else:
+                    conn = key.data
+                    if events & selectors.EVENT_READ:
+                        self._read(conn)
+                    if events & selectors.EVENT_WRITE and conn.socket in self._connections:
+                        self._write(conn)
+
+    def _accept(self):
+        try:
+            sock, address = self._listener.accept()
+        except (BlockingIOError, OSError):
+            return
+        sock.setblocking(False)
+        conn = _Connection(sock, address)
+        with self._lock:
+            self._connections[sock] = conn
+        self._selector.register(sock, selectors.EVENT_READ, conn)
+
+    def _read(self, conn):
+        try:
+            data = conn.socket.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._close(conn)
+            return
+        conn.inbox += data
+        if not conn.open:
+            self._handshake(conn)
+            return
+        while True:
+            frame = decode_frame(conn.inbox)
+            if frame is None:
+                return
+            opcode, payload, size = frame
+            del conn.inbox[:size]
+            if opcode == 0x8:  # close
+                self._send_now(conn, encode_frame(payload[:2], 0x8))
+                self._close(conn)
+                return
+            if opcode == 0x9:  # ping
+                with self._lock:
+                    conn.outbox += encode_frame(payload, 0xA)
+            elif opcode == 0x1:
+                self._on_text(conn, payload)
+
+    def _handshake(self, conn):
+        end = conn.inbox.find(b"\r\n\r\n")
+        if end < 0:
+            if len(conn.inbox) > MAX_HANDSHAKE_SIZE:
+                self._close(conn)
+            return
+        request = conn.inbox[:end].decode("latin-1").split("\r\n")
+        del conn.inbox[:end + 4]
+        headers = {}
+        for line in request[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        key = headers.get("sec-websocket-key")
+        parts = request[0].split()
+        if not key or len(parts) < 2:
+            self._send_now(conn, b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+            self._close(conn)
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        self._send_now(conn, (
+            "HTTP/1.1 101 Switching Protocols\r\n"
+            "Upgrade: websocket\r\n"
+            "Connection: Upgrade\r\n"
+            f"Sec-WebSocket-Accept: {accept}\r\n\r\n"
+        ).encode("ascii"))
+        conn.open = True
+        self.counters["connections"] += 1
+        query = parse_qs(urlsplit(parts[1]).query)
+        events = [name for value in query.get("events", []) + query.get("event", []) for name in value.split(",") if name]
+        self._subscribe(conn, events)
+
+    def _on_text(self, conn, payload):
+        try:
+            message = json.loads(payload.decode("utf-8"))
+        except ValueError:
+            return
+        if isinstance(message, dict) and isinstance(message.get("subscribe"), list):
+            self._subscribe(conn, [str(name) for name in message["subscribe"]])
+
+    def _subscribe(self, conn, events):
+        with self._lock:
+            for name in events:
+                conn.events.add(name)
+                self._subscribers.setdefault(name, set()).add(conn)
+
+    def _write(self, conn):
+        with self._lock:
+            try:
+                sent = conn.socket.send(conn.outbox)
+            except BlockingIOError:
+                return
+            except OSError:
+                sent = None
+            else:
+                del conn.outbox[:sent]
+        if sent is None:
+            self._close(conn)
+
+    def _send_now(self, conn, data):
+        # handshake and close replies are small; a full socket buffer here means a dead client
+        try:
+            conn.socket.sendall(data)
+        except OSError:
+            pass
+
+    def _close(self, conn):
+        with self._lock:
+            if self._connections.pop(conn.socket, None) is None:
+                return
+            for name in conn.events:
+                subscribers = self._subscribers.get(name)
+                if subscribers is not None:
+                    subscribers.discard(conn)
+        try:
+            self._selector.unregister(conn.socket)
+        except (KeyError, ValueError):
+            pass
+        conn.socket.close()